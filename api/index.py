@@ -1,6 +1,8 @@
 from app import create_app
 
-app = create_app()
+# Serverless cold starts: connect to MongoDB on first use instead of at
+# startup; run setup_mongodb.py once to apply the database migrations
+app = create_app(lazy_db=True)
 
 # For Vercel serverless functions
 if __name__ == "__main__":
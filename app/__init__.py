@@ -1,16 +1,72 @@
 import os
+import time
+
+# The cold start begins here, before Flask and the other dependencies load
+_import_started_at = time.perf_counter()
+
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
 from database import init_db, close_db
 from config import Config
+from .utils.startup_profile import StartupProfile
+
+_import_ms = (time.perf_counter() - _import_started_at) * 1000
+_imports_profiled = False
 
 # Initialize extensions
 jwt = JWTManager()
 
-def create_app():
-    """Create and configure the Flask application."""
+def create_app(async_io=False, lazy_db=None):
+    """Create and configure the Flask application.
+    
+    With async_io, the rankings, analytics and LLM endpoints do their
+    database and LLM I/O on a shared asyncio event loop (see async_app.py).
+    With lazy_db (Config.LAZY_DB_INIT by default), startup does not touch
+    the database; see database.init_db. Startup phases are timed in
+    app.config['STARTUP_PROFILE'].
+    """
+    global _imports_profiled
+    
+    # The first app of a process also accounts for the package imports
+    if _imports_profiled:
+        profile = StartupProfile()
+    else:
+        profile = StartupProfile(_import_started_at)
+        profile.add('imports', _import_ms)
+        _imports_profiled = True
+    
+    if lazy_db is None:
+        lazy_db = Config.LAZY_DB_INIT
+    
+    with profile.phase('config'):
+        app = _create_flask_app(async_io)
+    
+    with profile.phase('extensions'):
+        _init_extensions(app, profile)
+    
+    # Register blueprints
+    with profile.phase('blueprints'):
+        from .routes import register_blueprints
+        register_blueprints(app)
+        if async_io:
+            from .routes.async_views import register_async_views
+            register_async_views(app)
+    
+    # Initialize MongoDB
+    with profile.phase('database'):
+        with app.app_context():
+            init_db(lazy=lazy_db)
+    
+    startup_config = Config.get_startup_config()
+    app.config['STARTUP_PROFILE'] = profile
+    print(profile.summary(startup_config['cold_start_budget_ms']))
+    
+    return app
+
+def _create_flask_app(async_io):
+    """Create the Flask application with its configuration."""
     load_dotenv()  # Load .env variables
     
     app = Flask(__name__)
@@ -23,8 +79,12 @@ def create_app():
         JWT_ACCESS_TOKEN_EXPIRES=Config.JWT_ACCESS_TOKEN_EXPIRES,
         UPLOAD_FOLDER=os.path.join(app.root_path, '..', Config.UPLOAD_FOLDER),
         MAX_CONTENT_LENGTH=Config.MAX_CONTENT_LENGTH,
+        ASYNC_IO=async_io,
     )
-    
+    return app
+
+def _init_extensions(app, profile):
+    """Set up JWT, CORS and the request hooks."""
     # Initialize extensions
     jwt.init_app(app)
     
@@ -48,12 +108,12 @@ def create_app():
         response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
         return response
     
-    # Register blueprints
-    from .routes import register_blueprints
-    register_blueprints(app)
-    
-    # Initialize MongoDB
-    with app.app_context():
-        init_db()
+    # Cold start ends with the first response
+    @app.after_request
+    def record_first_request(response):
+        profile.request_served()
+        return response
     
-    return app
+    # Model lookups are cached per request; drop them once it is handled
+    from .models.identity_map import clear_identity_map
+    app.teardown_request(clear_identity_map)
@@ -0,0 +1,310 @@
+"""
+Async data access over Motor, mirroring the model APIs.
+Each Async* class has the lookups and writes of its model as coroutines.
+They load and return the regular models (Resume, Job, Ranking, User), so
+to_dict and the other model methods work as usual. Motor binds its client
+to one event loop, so these are awaited on the shared loop of
+utils.event_loop.
+"""
+
+import asyncio
+from datetime import datetime
+from bson import ObjectId
+from database import get_async_collection
+from config import Config
+from ..utils.corpus_stats import async_count_resume, async_remove_document
+from .resume import Resume
+from .job import Job
+from .ranking import Ranking
+from .user import User
+from .pagination import async_paginate, page_count
+from .write_effects import (
+    counts_in_corpus, job_deleted, job_saved, ranking_deleted, ranking_saved, rankings_written,
+    resume_deleted, resume_saved, user_deleted, user_saved
+)
+
+def _object_id(value):
+    """Convert a string id to an ObjectId."""
+    return ObjectId(value) if isinstance(value, str) else value
+
+class AsyncModel:
+    """Async lookups and writes shared by every model.
+
+    Subclasses set model, collection_name and, for lists, list_key and
+    sort_field.
+    """
+
+    model = None
+    collection_name = None
+    list_key = None
+    sort_field = None
+
+    @classmethod
+    def collection(cls):
+        """Get the Motor collection of the model."""
+        return get_async_collection(cls.collection_name)
+
+    @classmethod
+    def from_dict(cls, data, projection=None):
+        """Build a model from a loaded document."""
+        if projection:
+            return cls.model.from_dict(data, projection)
+        return cls.model.from_dict(data)
+
+    @classmethod
+    async def find_by_id(cls, model_id, projection=None):
+        """Find a model by ID."""
+        data = await cls.collection().find_one({'_id': _object_id(model_id)}, projection)
+        return cls.from_dict(data, projection) if data else None
+
+    @classmethod
+    async def find_by_ids(cls, model_ids, projection=None):
+        """Find many models with a single query.
+
+        Returns a dict mapping each found model's _id to the model.
+        """
+        model_ids = list({_object_id(model_id) for model_id in model_ids})
+        if not model_ids:
+            return {}
+        documents = await cls.collection().find({'_id': {'$in': model_ids}}, projection).to_list(None)
+        return {data['_id']: cls.from_dict(data, projection) for data in documents}
+
+    @classmethod
+    async def _list(cls, query, page, per_page, projection, after, count):
+        """Get one page of models, shaped like the model's list results."""
+        documents, total, next_cursor = await async_paginate(
+            cls.collection(), query, cls.sort_field, page, per_page, projection, after, count
+        )
+        return {
+            cls.list_key: [cls.from_dict(data, projection) for data in documents],
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': page_count(total, per_page),
+            'next_cursor': next_cursor
+        }
+
+    @classmethod
+    async def _write(cls, model, document):
+        """Update a model's stored document, or insert it when it has no _id."""
+        if model._id:
+            await cls.collection().update_one({'_id': model._id}, {'$set': document})
+        else:
+            result = await cls.collection().insert_one(document)
+            model._id = result.inserted_id
+
+    @classmethod
+    async def save_many(cls, models):
+        """Save many models concurrently."""
+        return await asyncio.gather(*(cls.save(model) for model in models))
+
+    @classmethod
+    async def delete_many(cls, models):
+        """Delete many models concurrently."""
+        await asyncio.gather(*(cls.delete(model) for model in models))
+
+class AsyncResume(AsyncModel):
+    """Async data access for Resume."""
+
+    model = Resume
+    collection_name = 'resumes'
+    list_key = 'resumes'
+    sort_field = 'uploaded_at'
+
+    @classmethod
+    async def get_all(cls, status=None, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get all resumes with optional filtering and pagination (see Resume.get_all)."""
+        query = {}
+        if status:
+            query['processing_status'] = status
+        return await cls._list(query, page, per_page, projection, after, count)
+
+    @classmethod
+    async def save(cls, resume):
+        """Save a resume (see Resume.save)."""
+        if resume.projection:
+            raise ValueError('Cannot save a partially loaded resume')
+
+        await cls._write(resume, resume.to_document())
+
+        # Count the resume in the corpus statistics once parsing has completed
+        if counts_in_corpus(resume):
+            await async_count_resume(resume)
+        resume_saved(resume)
+        return resume
+
+    @classmethod
+    async def delete(cls, resume):
+        """Delete a resume and its rankings (see Resume.delete)."""
+        if not resume._id:
+            return
+
+        # Corpus statistics need the stored terms of the resume
+        if not resume.is_loaded('corpus_terms'):
+            stored = await cls.collection().find_one({'_id': resume._id}, {'corpus_terms': 1}) or {}
+            corpus_terms = stored.get('corpus_terms')
+        else:
+            corpus_terms = resume.corpus_terms
+
+        await get_async_collection('rankings').delete_many({'resume_id': resume._id})
+        result = await cls.collection().delete_one({'_id': resume._id})
+
+        if result.deleted_count and corpus_terms is not None:
+            await async_remove_document(corpus_terms)
+
+        resume_deleted(resume._id)
+
+class AsyncJob(AsyncModel):
+    """Async data access for Job."""
+
+    model = Job
+    collection_name = 'jobs'
+    list_key = 'jobs'
+    sort_field = 'created_at'
+
+    @classmethod
+    async def get_all(cls, status=None, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get all jobs with optional filtering and pagination (see Job.get_all)."""
+        query = {}
+        if status:
+            query['status'] = status
+        return await cls._list(query, page, per_page, projection, after, count)
+
+    @classmethod
+    async def save(cls, job):
+        """Save a job (see Job.save)."""
+        if job.projection:
+            raise ValueError('Cannot save a partially loaded job')
+
+        job.updated_at = datetime.utcnow()
+        await cls._write(job, job.to_document())
+        job_saved(job)
+        return job
+
+    @classmethod
+    async def delete(cls, job):
+        """Delete a job and its rankings (see Job.delete)."""
+        if not job._id:
+            return
+
+        await get_async_collection('rankings').delete_many({'job_id': job._id})
+        await cls.collection().delete_one({'_id': job._id})
+        job_deleted(job._id)
+
+class AsyncRanking(AsyncModel):
+    """Async data access for Ranking."""
+
+    model = Ranking
+    collection_name = 'rankings'
+    list_key = 'rankings'
+    sort_field = 'overall_score'
+
+    @classmethod
+    async def find_by_resume_and_job(cls, resume_id, job_id):
+        """Find ranking by resume and job IDs."""
+        data = await cls.collection().find_one({'resume_id': _object_id(resume_id), 'job_id': _object_id(job_id)})
+        return cls.from_dict(data) if data else None
+
+    @classmethod
+    async def get_by_job(cls, job_id, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get rankings for a specific job (see Ranking.get_by_job)."""
+        return await cls._list({'job_id': _object_id(job_id)}, page, per_page, projection, after, count)
+
+    @classmethod
+    async def get_by_resume(cls, resume_id, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get rankings for a specific resume (see Ranking.get_by_resume)."""
+        return await cls._list({'resume_id': _object_id(resume_id)}, page, per_page, projection, after, count)
+
+    @classmethod
+    async def get_all(cls, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get all rankings with pagination (see Ranking.get_all)."""
+        return await cls._list({}, page, per_page, projection, after, count)
+
+    @classmethod
+    async def save(cls, ranking):
+        """Save a ranking, updating the stored one for the same resume and job (see Ranking.save)."""
+        if ranking.projection:
+            raise ValueError('Cannot save a partially loaded ranking')
+
+        ranking.updated_at = datetime.utcnow()
+        ranking_data = ranking.to_document()
+
+        existing = await cls.collection().find_one({'resume_id': ranking.resume_id, 'job_id': ranking.job_id})
+        if existing and ranking._id != existing['_id']:
+            await cls.collection().update_one({'_id': existing['_id']}, {'$set': ranking_data})
+            ranking._id = existing['_id']
+        else:
+            await cls._write(ranking, ranking_data)
+
+        ranking_saved(ranking)
+        return ranking
+
+    @classmethod
+    async def bulk_upsert(cls, rankings, batch_size=None):
+        """Insert or update many rankings with unordered bulk writes (see Ranking.bulk_upsert)."""
+        batch_size = batch_size or Config.get_ranking_config()['write_batch_size']
+        rankings = list(rankings)
+        summary = {'matched': 0, 'modified': 0, 'upserted': 0}
+
+        for start in range(0, len(rankings), batch_size):
+            batch = rankings[start:start + batch_size]
+            now = datetime.utcnow()
+
+            result = await cls.collection().bulk_write([ranking.upsert_operation(now) for ranking in batch], ordered=False)
+            summary['matched'] += result.matched_count
+            summary['modified'] += result.modified_count
+            summary['upserted'] += result.upserted_count
+
+            # Rankings that already existed keep their stored _id and created_at
+            existing = [ranking for index, ranking in enumerate(batch) if index not in result.upserted_ids]
+            if existing:
+                stored = await cls.collection().find(*Ranking.stored_keys_query(existing)).to_list(None)
+                Ranking.set_stored_keys(existing, stored)
+
+        rankings_written()
+        return summary
+
+    @classmethod
+    async def save_many(cls, rankings):
+        """Save many rankings with bulk upserts."""
+        await cls.bulk_upsert(rankings)
+        return rankings
+
+    @classmethod
+    async def delete(cls, ranking):
+        """Delete a ranking."""
+        if ranking._id:
+            await cls.collection().delete_one({'_id': ranking._id})
+            ranking_deleted(ranking._id)
+
+class AsyncUser(AsyncModel):
+    """Async data access for User."""
+
+    model = User
+    collection_name = 'users'
+
+    @classmethod
+    async def find_by_email(cls, email):
+        """Find user by email."""
+        data = await cls.collection().find_one({'email': email})
+        return cls.from_dict(data) if data else None
+
+    @classmethod
+    async def get_all(cls):
+        """Get all users."""
+        return [cls.from_dict(data) for data in await cls.collection().find().to_list(None)]
+
+    @classmethod
+    async def save(cls, user):
+        """Save a user."""
+        user.updated_at = datetime.utcnow()
+        await cls._write(user, user.to_document())
+        user_saved(user)
+        return user
+
+    @classmethod
+    async def delete(cls, user):
+        """Delete a user."""
+        if user._id:
+            await cls.collection().delete_one({'_id': user._id})
+            user_deleted(user._id)
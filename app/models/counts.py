@@ -0,0 +1,84 @@
+"""
+Totals for paginated list queries.
+Exact counts are cached per collection and query for Config.COUNT_CACHE_TTL
+seconds, keeping the Config.COUNT_CACHE_SIZE most recently used. Writes
+through the models drop the cached counts of their collection; writes from
+other processes show up once the TTL expires.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from bson import json_util
+from config import Config
+
+# How a list query's total is computed, chosen with ?count=
+COUNT_MODES = ('exact', 'estimated', 'none')
+
+# (collection name, query key) -> (total, loaded_at), least recently used first
+_counts = OrderedDict()
+_counts_lock = threading.Lock()
+
+def _query_key(query):
+    """Get a stable cache key for a query."""
+    return json_util.dumps(query, sort_keys=True)
+
+def _cached_count(collection, query, mode):
+    """Get (cache key, cached total) for a count, the total None when it must be counted."""
+    key = (collection.name, _query_key(query))
+    if mode == 'estimated':
+        ttl = Config.get_pagination_config()['count_cache_ttl']
+        with _counts_lock:
+            cached = _counts.get(key)
+            if cached and time.monotonic() - cached[1] <= ttl:
+                _counts.move_to_end(key)
+                return key, cached[0]
+            if cached:
+                # Expired
+                del _counts[key]
+    return key, None
+
+def _store_count(key, total):
+    """Cache a counted total, dropping the least recently used ones over the size limit."""
+    cache_size = Config.get_pagination_config()['count_cache_size']
+    with _counts_lock:
+        _counts[key] = (total, time.monotonic())
+        _counts.move_to_end(key)
+        while len(_counts) > cache_size:
+            _counts.popitem(last=False)
+    return total
+
+def count_documents(collection, query, mode='estimated'):
+    """Get the total number of documents matching a list query.
+
+    'exact' always counts. 'estimated' uses the collection metadata count
+    for unfiltered queries and a cached exact count otherwise. 'none'
+    skips counting and returns None.
+    """
+    if mode == 'none':
+        return None
+    if mode == 'estimated' and not query:
+        return collection.estimated_document_count()
+
+    key, total = _cached_count(collection, query, mode)
+    if total is not None:
+        return total
+    return _store_count(key, collection.count_documents(query))
+
+async def async_count_documents(collection, query, mode='estimated'):
+    """count_documents for a Motor collection."""
+    if mode == 'none':
+        return None
+    if mode == 'estimated' and not query:
+        return await collection.estimated_document_count()
+
+    key, total = _cached_count(collection, query, mode)
+    if total is not None:
+        return total
+    return _store_count(key, await collection.count_documents(query))
+
+def invalidate_counts(*collection_names):
+    """Drop the cached counts of collections that were written to."""
+    with _counts_lock:
+        for key in [key for key in _counts if key[0] in collection_names]:
+            del _counts[key]
@@ -0,0 +1,28 @@
+"""
+Document-backed model fields.
+Models keep the stored document as it came from the database and read
+each field from it only when the field is accessed.
+"""
+
+class Field:
+    """Model attribute read from, and written to, the model's document.
+
+    default is returned when the document does not have the field.
+    """
+
+    __slots__ = ('name', 'default')
+
+    def __init__(self, default=None):
+        self.name = None
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance._data.get(self.name, self.default)
+
+    def __set__(self, instance, value):
+        instance._data[self.name] = value
@@ -0,0 +1,131 @@
+"""
+Request-scoped identity map for model lookups.
+While a request is handled, every document loaded by _id is kept on
+flask.g, so looking the same _id up again returns the same model without
+a query. Ids queued with defer() are loaded together with the next lookup
+on their collection, turning scattered lookups into one query.
+"""
+
+from flask import g, has_request_context
+from database import get_collection
+
+class IdentityMap:
+    """Models loaded during one request, by collection name and _id.
+
+    A stored None records an _id that has no document.
+    """
+
+    __slots__ = ('models', 'pending')
+
+    def __init__(self):
+        self.models = {}
+        self.pending = {}
+
+    def lookup(self, collection_name, ids):
+        """Split ids into ({_id: model} already known, [_id] still to load)."""
+        models = self.models.get(collection_name, {})
+        found = {}
+        missing = []
+        for _id in ids:
+            if _id in models:
+                if models[_id] is not None:
+                    found[_id] = models[_id]
+            else:
+                missing.append(_id)
+        return found, missing
+
+    def add(self, collection_name, _id, model):
+        """Record the model loaded for an _id, or None when there is none."""
+        self.models.setdefault(collection_name, {})[_id] = model
+        pending = self.pending.get(collection_name)
+        if pending:
+            pending.discard(_id)
+
+    def defer(self, collection_name, ids):
+        """Queue ids to be loaded with the next lookup on a collection."""
+        known = self.models.get(collection_name, {})
+        self.pending.setdefault(collection_name, set()).update(_id for _id in ids if _id not in known)
+
+    def take_pending(self, collection_name):
+        """Get and clear the ids queued for a collection."""
+        return self.pending.pop(collection_name, set())
+
+    def forget(self, collection_name, ids=None):
+        """Drop the models of some ids, or of the whole collection, after a write."""
+        if ids is None:
+            self.models.pop(collection_name, None)
+            return
+        models = self.models.get(collection_name)
+        if models:
+            for _id in ids:
+                models.pop(_id, None)
+
+def get_identity_map():
+    """Get the identity map of the current request, or None outside a request."""
+    if not has_request_context():
+        return None
+    if 'identity_map' not in g:
+        g.identity_map = IdentityMap()
+    return g.identity_map
+
+def clear_identity_map(exception=None):
+    """Drop the identity map at the end of a request."""
+    g.pop('identity_map', None)
+
+def _from_document(model_class, document, projection):
+    """Build a model from a loaded document."""
+    if projection:
+        return model_class.from_dict(document, projection)
+    return model_class.from_dict(document)
+
+def load_by_ids(model_class, collection_name, ids, projection=None):
+    """Load models by _id, going through the request's identity map.
+
+    Returns a dict mapping each found _id to its model. Inside a request,
+    known ids are served from the map; the rest, plus any deferred ids of
+    the collection, are loaded with a single $in query and remembered.
+    Models loaded with a projection are returned but not remembered, and
+    then deferred ids stay queued for a full lookup.
+    """
+    collection = get_collection(collection_name)
+    identity_map = get_identity_map()
+    if identity_map is None:
+        documents = collection.find({'_id': {'$in': list(ids)}}, projection)
+        return {document['_id']: _from_document(model_class, document, projection) for document in documents}
+
+    found, missing = identity_map.lookup(collection_name, ids)
+    if missing and projection:
+        documents = collection.find({'_id': {'$in': missing}}, projection)
+        found.update((document['_id'], _from_document(model_class, document, projection)) for document in documents)
+    elif missing:
+        missing = set(missing)
+        to_load = missing | identity_map.take_pending(collection_name)
+        loaded = {document['_id']: document for document in collection.find({'_id': {'$in': list(to_load)}})}
+        for _id in to_load:
+            model = model_class.from_dict(loaded[_id]) if _id in loaded else None
+            identity_map.add(collection_name, _id, model)
+            if model is not None and _id in missing:
+                found[_id] = model
+    return found
+
+def remember(collection_name, model):
+    """Record a saved model in the request's identity map."""
+    identity_map = get_identity_map()
+    if identity_map is not None:
+        identity_map.add(collection_name, model._id, model)
+
+def defer(collection_name, ids):
+    """Queue ids to be loaded with the next lookup on a collection."""
+    identity_map = get_identity_map()
+    if identity_map is not None:
+        identity_map.defer(collection_name, ids)
+
+def forget(collection_name, ids=None):
+    """Drop models from the request's identity map after a write.
+
+    Without ids the whole collection is dropped, for writes that touch
+    documents by something other than _id.
+    """
+    identity_map = get_identity_map()
+    if identity_map is not None:
+        identity_map.forget(collection_name, ids)
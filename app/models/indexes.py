@@ -0,0 +1,212 @@
+"""
+Index registry for the HR Resume System collections.
+Each index lists the model query shapes it serves. create_indexes builds
+them, and explain_queries checks that every registered query is answered
+from an index, without a collection scan or an in-memory sort.
+"""
+
+from datetime import datetime
+from bson import ObjectId
+from .pagination import after_filter
+from ..utils.resume_features import FEATURE_VERSION
+
+# Placeholder values for the example queries; only their types matter
+SAMPLE_ID = ObjectId('000000000000000000000000')
+SAMPLE_DATE = datetime(2024, 1, 1)
+SAMPLE_SCORE = 0.5
+
+RESUME_ORDER = [('uploaded_at', -1), ('_id', -1)]
+JOB_ORDER = [('created_at', -1), ('_id', -1)]
+RANKING_ORDER = [('overall_score', -1), ('_id', -1)]
+
+def _query(filter, sort=None):
+    """Build an example query shape."""
+    return {'filter': filter, 'sort': sort}
+
+def _list_queries(name, query, order, sample):
+    """Example queries of a paginated list: first page, cursor page and count.
+
+    Unfiltered lists are counted from collection metadata, so they have no
+    count query.
+    """
+    sort_field = order[0][0]
+    page_query = dict(query, **after_filter(sort_field, sample, SAMPLE_ID))
+    queries = {
+        name: _query(query, order),
+        f'{name} after cursor': _query(page_query, order)
+    }
+    if query:
+        queries[f'{name} count'] = _query(query)
+    return queries
+
+INDEXES = [
+    # Users
+    {
+        'collection': 'users',
+        'keys': [('email', 1)],
+        'options': {'unique': True},
+        'queries': {
+            'User.find_by_email': _query({'email': 'admin@example.com'})
+        }
+    },
+
+    # Resumes
+    {
+        'collection': 'resumes',
+        'keys': [('uploaded_at', -1), ('_id', -1)],
+        'queries': _list_queries('Resume.get_all', {}, RESUME_ORDER, SAMPLE_DATE)
+    },
+    {
+        'collection': 'resumes',
+        'keys': [('processing_status', 1), ('uploaded_at', -1), ('_id', -1)],
+        'queries': dict(
+            _list_queries('Resume.get_all by status', {'processing_status': 'completed'}, RESUME_ORDER, SAMPLE_DATE),
+            **{
+                'rank_all_jobs resumes': _query({'processing_status': 'completed'}),
+                'Resume.find_by_skills newest ids': _query({'processing_status': 'completed'}, RESUME_ORDER)
+            }
+        )
+    },
+    {
+        # Inverted skill index (multikey), kept current as resumes are parsed or deleted
+        'collection': 'resumes',
+        'keys': [('features.skills', 1)],
+        'queries': {
+            'Resume.find_by_skills': _query({
+                '$or': [
+                    {'features.skills': {'$in': ['python', 'sql']}},
+                    {'features.version': {'$ne': FEATURE_VERSION}}
+                ],
+                'processing_status': 'completed'
+            }),
+            # With a limit the search is restricted to the ids of the newest
+            # resumes, which the planner may answer from the _id index instead
+            'Resume.find_by_skills limited': _query({
+                '$or': [
+                    {'features.skills': {'$in': ['python', 'sql']}},
+                    {'features.version': {'$ne': FEATURE_VERSION}}
+                ],
+                'processing_status': 'completed',
+                '_id': {'$in': [SAMPLE_ID]}
+            })
+        }
+    },
+    {
+        # Second $or branch of find_by_skills: feature record missing or outdated
+        'collection': 'resumes',
+        'keys': [('features.version', 1)],
+        'queries': {
+            'Resume.find_by_skills stale features': _query({'features.version': {'$ne': FEATURE_VERSION}})
+        }
+    },
+    {
+        # Exact duplicate lookup
+        'collection': 'resumes',
+        'keys': [('file_hash', 1)],
+        'queries': {
+            'find_canonical_by_hash': _query({
+                'file_hash': '0' * 64, 'processing_status': 'completed', '_id': {'$ne': SAMPLE_ID}
+            })
+        }
+    },
+    {
+        # Near-duplicate candidates by MinHash LSH band (multikey)
+        'collection': 'resumes',
+        'keys': [('lsh_bands', 1)],
+        'queries': {
+            'find_near_duplicate': _query({
+                'lsh_bands': {'$in': ['0:0000000000000000', '1:0000000000000000']},
+                'processing_status': 'completed',
+                '_id': {'$ne': SAMPLE_ID}
+            })
+        }
+    },
+
+    # Jobs
+    {
+        'collection': 'jobs',
+        'keys': [('created_at', -1), ('_id', -1)],
+        'queries': _list_queries('Job.get_all', {}, JOB_ORDER, SAMPLE_DATE)
+    },
+    {
+        'collection': 'jobs',
+        'keys': [('status', 1), ('created_at', -1), ('_id', -1)],
+        'queries': dict(
+            _list_queries('Job.get_all by status', {'status': 'active'}, JOB_ORDER, SAMPLE_DATE),
+            **{'rank_all_jobs jobs': _query({'status': 'active'})}
+        )
+    },
+
+    # Rankings
+    {
+        'collection': 'rankings',
+        'keys': [('resume_id', 1), ('job_id', 1)],
+        'options': {'unique': True},
+        'queries': {
+            'Ranking.find_by_resume_and_job': _query({'resume_id': SAMPLE_ID, 'job_id': SAMPLE_ID}),
+            'Ranking.bulk_upsert existing': _query({
+                'resume_id': {'$in': [SAMPLE_ID]}, 'job_id': {'$in': [SAMPLE_ID]}
+            })
+        }
+    },
+    {
+        'collection': 'rankings',
+        'keys': [('job_id', 1), ('overall_score', -1), ('_id', -1)],
+        'queries': dict(
+            _list_queries('Ranking.get_by_job', {'job_id': SAMPLE_ID}, RANKING_ORDER, SAMPLE_SCORE),
+            **{'Ranking.delete_stale': _query({'job_id': SAMPLE_ID, 'updated_at': {'$lt': SAMPLE_DATE}})}
+        )
+    },
+    {
+        'collection': 'rankings',
+        'keys': [('resume_id', 1), ('overall_score', -1), ('_id', -1)],
+        'queries': _list_queries('Ranking.get_by_resume', {'resume_id': SAMPLE_ID}, RANKING_ORDER, SAMPLE_SCORE)
+    },
+    {
+        'collection': 'rankings',
+        'keys': [('overall_score', -1), ('_id', -1)],
+        'queries': _list_queries('Ranking.get_all', {}, RANKING_ORDER, SAMPLE_SCORE)
+    }
+]
+
+def create_indexes(db):
+    """Create every registered index."""
+    for index in INDEXES:
+        db[index['collection']].create_index(index['keys'], **index.get('options', {}))
+
+def _plan_stages(plan):
+    """Get the stage names of a query plan tree."""
+    stages = []
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            stages.append(plan['stage'])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+def explain_queries(db):
+    """Explain every registered query.
+
+    Returns a list of (collection, query name, winning plan stages, problem)
+    where problem is None, or names the COLLSCAN or in-memory SORT stage the
+    plan uses.
+    """
+    results = []
+    for index in INDEXES:
+        for name, query in index['queries'].items():
+            cursor = db[index['collection']].find(query['filter'])
+            if query['sort']:
+                cursor = cursor.sort(query['sort'])
+            plan = cursor.explain()['queryPlanner']['winningPlan']
+            stages = _plan_stages(plan)
+
+            problem = None
+            if 'COLLSCAN' in stages:
+                problem = 'collection scan'
+            elif 'SORT' in stages:
+                problem = 'in-memory sort'
+            results.append((index['collection'], name, stages, problem))
+    return results
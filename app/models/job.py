@@ -1,12 +1,36 @@
 from datetime import datetime
 from bson import ObjectId
 from database import get_collection
+from .projection import is_field_loaded
+from .pagination import page_count, paginate
+from .identity_map import defer, load_by_ids
+from .write_effects import job_deleted, job_saved
+from .fields import Field
 
 class Job:
     """Job model for storing job postings and requirements."""
     
+    __slots__ = ('_data', 'projection')
+    
+    _id = Field()
+    title = Field()
+    description = Field()
+    company = Field()
+    location = Field()
+    employment_type = Field('full-time')
+    requirements = Field()
+    salary_min = Field()
+    salary_max = Field()
+    currency = Field('USD')
+    status = Field('active')
+    priority = Field(1)
+    created_at = Field()
+    updated_at = Field()
+    expires_at = Field()
+    
     def __init__(self, title=None, description=None, company=None, location=None,
                  employment_type='full-time', _id=None, **kwargs):
+        self._data = {}
         self._id = _id or ObjectId()
         self.title = title
         self.description = description
@@ -29,34 +53,31 @@ class Job:
         self.created_at = kwargs.get('created_at', datetime.utcnow())
         self.updated_at = kwargs.get('updated_at', datetime.utcnow())
         self.expires_at = kwargs.get('expires_at')
+        
+        # Projection the job was loaded with; None for a full document
+        self.projection = kwargs.get('projection')
     
     @classmethod
-    def from_dict(cls, data):
-        """Create Job instance from dictionary."""
-        return cls(
-            _id=data.get('_id'),
-            title=data.get('title'),
-            description=data.get('description'),
-            company=data.get('company'),
-            location=data.get('location'),
-            employment_type=data.get('employment_type', 'full-time'),
-            requirements=data.get('requirements'),
-            salary_min=data.get('salary_min'),
-            salary_max=data.get('salary_max'),
-            currency=data.get('currency', 'USD'),
-            status=data.get('status', 'active'),
-            priority=data.get('priority', 1),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at'),
-            expires_at=data.get('expires_at')
-        )
-    
-    def save(self):
-        """Save job to database."""
-        jobs_collection = get_collection('jobs')
-        self.updated_at = datetime.utcnow()
+    def from_dict(cls, data, projection=None):
+        """Create Job instance from dictionary.
         
-        job_data = {
+        The dictionary is wrapped, not copied; fields are read from it when
+        they are first accessed.
+        """
+        job = cls.__new__(cls)
+        job._data = data
+        job.projection = projection
+        if not job._id:
+            job._id = ObjectId()
+        return job
+    
+    def is_loaded(self, field):
+        """Check whether a field was loaded from the database."""
+        return is_field_loaded(self.projection, field)
+    
+    def to_document(self):
+        """Get the job fields stored in the database."""
+        return {
             'title': self.title,
             'description': self.description,
             'company': self.company,
@@ -72,6 +93,16 @@ class Job:
             'updated_at': self.updated_at,
             'expires_at': self.expires_at
         }
+    
+    def save(self):
+        """Save job to database."""
+        if self.projection:
+            raise ValueError('Cannot save a partially loaded job')
+        
+        jobs_collection = get_collection('jobs')
+        self.updated_at = datetime.utcnow()
+        
+        job_data = self.to_document()
         
         if hasattr(self, '_id') and self._id:
             # Update existing job
@@ -84,6 +115,8 @@ class Job:
             result = jobs_collection.insert_one(job_data)
             self._id = result.inserted_id
         
+        job_saved(self)
+        
         return self
     
     def delete(self):
@@ -96,19 +129,44 @@ class Job:
             rankings_collection.delete_many({'job_id': self._id})
             # Delete job
             jobs_collection.delete_one({'_id': self._id})
+            job_deleted(self._id)
     
     @classmethod
-    def find_by_id(cls, job_id):
-        """Find job by ID."""
-        jobs_collection = get_collection('jobs')
+    def find_by_id(cls, job_id, projection=None):
+        """Find job by ID.
+        
+        Within a request, a job already looked up is returned again without
+        a query (see identity_map).
+        """
         if isinstance(job_id, str):
             job_id = ObjectId(job_id)
-        job_data = jobs_collection.find_one({'_id': job_id})
-        return cls.from_dict(job_data) if job_data else None
+        return load_by_ids(cls, 'jobs', [job_id], projection).get(job_id)
     
     @classmethod
-    def get_all(cls, status=None, page=1, per_page=10):
-        """Get all jobs with optional filtering and pagination."""
+    def find_by_ids(cls, job_ids, projection=None):
+        """Find many jobs with a single query.
+        
+        Returns a dict mapping each found job's _id to the job. With a
+        projection, only those fields are loaded.
+        """
+        job_ids = list({ObjectId(job_id) if isinstance(job_id, str) else job_id for job_id in job_ids})
+        if not job_ids:
+            return {}
+        return load_by_ids(cls, 'jobs', job_ids, projection)
+    
+    @classmethod
+    def prefetch(cls, job_ids):
+        """Queue jobs to be loaded with the next lookup in this request."""
+        defer('jobs', [ObjectId(job_id) if isinstance(job_id, str) else job_id for job_id in job_ids])
+    
+    @classmethod
+    def get_all(cls, status=None, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get all jobs with optional filtering and pagination.
+        
+        Pass the returned next_cursor as after to get the following page
+        without skipping over the earlier ones. count is 'exact',
+        'estimated' or 'none' (total and pages are then None).
+        """
         jobs_collection = get_collection('jobs')
         
         # Build query
@@ -116,22 +174,19 @@ class Job:
         if status:
             query['status'] = status
         
-        # Calculate skip value for pagination
-        skip = (page - 1) * per_page
-        
-        # Get jobs with pagination
-        jobs_cursor = jobs_collection.find(query).skip(skip).limit(per_page).sort('created_at', -1)
-        jobs = [cls.from_dict(job_data) for job_data in jobs_cursor]
-        
-        # Get total count
-        total = jobs_collection.count_documents(query)
+        # Get jobs with pagination, newest first
+        jobs_data, total, next_cursor = paginate(
+            jobs_collection, query, 'created_at', page, per_page, projection, after, count
+        )
+        jobs = [cls.from_dict(job_data, projection) for job_data in jobs_data]
         
         return {
             'jobs': jobs,
             'total': total,
             'page': page,
             'per_page': per_page,
-            'pages': (total + per_page - 1) // per_page
+            'pages': page_count(total, per_page),
+            'next_cursor': next_cursor
         }
     
     def to_dict(self):
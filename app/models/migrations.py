@@ -0,0 +1,146 @@
+"""
+Versioned, one-time database migrations.
+Schema and index setup and seed data are applied once per database, in
+version order, and recorded in the _migrations collection. Applied
+migrations are never edited; changes go in a new migration with the next
+version (for example, after INDEXES changes, one that calls create_indexes
+again).
+"""
+
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from .indexes import create_indexes
+
+MIGRATIONS_COLLECTION = '_migrations'
+
+# A migration 'running' for longer than this was left by a crashed run and is retried
+MIGRATION_TIMEOUT = timedelta(minutes=10)
+
+def _create_indexes(db):
+    """Create the registered indexes (see indexes.INDEXES)."""
+    create_indexes(db)
+
+def _create_default_admin(db):
+    """Create the default admin user if there is none."""
+    if db.users.find_one({"email": "admin@example.com"}):
+        return
+    from werkzeug.security import generate_password_hash
+    db.users.insert_one({
+        "email": "admin@example.com",
+        "password_hash": generate_password_hash("admin123"),
+        "role": "admin",
+        "is_active": True,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    })
+
+def _create_sample_jobs(db):
+    """Add sample jobs to an empty jobs collection."""
+    if db.jobs.count_documents({}) > 0:
+        return
+    db.jobs.insert_many([
+        {
+            "title": "Software Engineer",
+            "description": "We are looking for a skilled software engineer to join our team",
+            "company": "Tech Corp",
+            "location": "San Francisco, CA",
+            "employment_type": "full-time",
+            "requirements": {
+                "skills": ["Python", "React", "JavaScript", "SQL"],
+                "experience_years": 3,
+                "education": "Bachelor degree"
+            },
+            "salary_min": 80000,
+            "salary_max": 120000,
+            "currency": "USD",
+            "status": "active",
+            "priority": 1,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        },
+        {
+            "title": "Data Scientist",
+            "description": "Join our data science team to analyze complex datasets",
+            "company": "Data Analytics Inc",
+            "location": "New York, NY",
+            "employment_type": "full-time",
+            "requirements": {
+                "skills": ["Python", "Machine Learning", "SQL", "Statistics"],
+                "experience_years": 2,
+                "education": "Master degree"
+            },
+            "salary_min": 90000,
+            "salary_max": 140000,
+            "currency": "USD",
+            "status": "active",
+            "priority": 2,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+    ])
+
+# (version, name, apply function), in the order they are applied
+MIGRATIONS = [
+    (1, 'create indexes', _create_indexes),
+    (2, 'default admin user', _create_default_admin),
+    (3, 'sample jobs', _create_sample_jobs)
+]
+
+def applied_migrations(db):
+    """Get the migration records of a database, by version."""
+    return {record['_id']: record for record in db[MIGRATIONS_COLLECTION].find()}
+
+def pending_migrations(db):
+    """Get the (version, name, apply) migrations not applied to a database yet."""
+    applied = applied_migrations(db)
+    return [
+        migration for migration in MIGRATIONS
+        if applied.get(migration[0], {}).get('status') != 'applied'
+    ]
+
+def _claim(migrations_collection, version, name):
+    """Claim a migration for this process; returns False if another process holds it.
+
+    A 'running' record older than MIGRATION_TIMEOUT is left over from a run
+    that crashed, and is taken over.
+    """
+    now = datetime.utcnow()
+    try:
+        migrations_collection.insert_one({'_id': version, 'name': name, 'status': 'running', 'started_at': now})
+        return True
+    except DuplicateKeyError:
+        pass
+
+    stale = migrations_collection.find_one_and_update(
+        {'_id': version, 'status': 'running', 'started_at': {'$lt': now - MIGRATION_TIMEOUT}},
+        {'$set': {'started_at': now}}
+    )
+    return stale is not None
+
+def apply_migrations(db):
+    """Apply the pending migrations in version order.
+
+    Each migration is claimed by inserting its record first, so concurrent
+    runs apply it only once; a failed migration's record is removed so the
+    next run retries it. A migration still being applied by another process
+    stops the run, since later versions may depend on it. Returns the
+    (version, name) of the migrations applied by this call.
+    """
+    migrations_collection = db[MIGRATIONS_COLLECTION]
+    applied = []
+    for version, name, apply in pending_migrations(db):
+        if not _claim(migrations_collection, version, name):
+            break
+
+        try:
+            apply(db)
+        except Exception:
+            migrations_collection.delete_one({'_id': version})
+            raise
+
+        migrations_collection.update_one(
+            {'_id': version},
+            {'$set': {'status': 'applied', 'applied_at': datetime.utcnow()}}
+        )
+        applied.append((version, name))
+    return applied
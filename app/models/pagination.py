@@ -0,0 +1,108 @@
+"""
+Offset and keyset (cursor) pagination for model list queries.
+Lists are sorted by one field, highest first, with _id breaking ties. A
+cursor encodes the (sort value, _id) of the last document on a page.
+"""
+
+import base64
+import binascii
+from bson import json_util
+from bson.errors import BSONError
+from .projection import with_fields
+from .counts import COUNT_MODES, async_count_documents, count_documents
+
+class InvalidPagination(ValueError):
+    """Raised for a pagination cursor or count mode that cannot be used."""
+
+def encode_cursor(document, sort_field):
+    """Build the opaque cursor that continues after a document."""
+    key = json_util.dumps([document.get(sort_field), document['_id']])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+def decode_cursor(token):
+    """Get the (sort value, _id) pair of a cursor; raises InvalidPagination if invalid."""
+    try:
+        key = json_util.loads(base64.urlsafe_b64decode(token.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, IndexError, KeyError,
+            ArithmeticError, BSONError):
+        # Malformed base64, JSON or extended JSON values such as {"$oid": "zz"}
+        raise InvalidPagination('Invalid pagination cursor')
+    if not isinstance(key, list) or len(key) != 2:
+        raise InvalidPagination('Invalid pagination cursor')
+    value, _id = key
+    return value, _id
+
+def after_filter(sort_field, value, _id):
+    """Match the documents sorted after (value, _id), highest first.
+
+    The range on sort_field alone bounds the (sort_field, _id) index scan,
+    so the index still provides the order; the $or only drops the rows
+    sharing value that were already returned.
+    """
+    if value is None:
+        # Missing values sort last
+        return {sort_field: None, '_id': {'$lt': _id}}
+    return {
+        sort_field: {'$not': {'$gt': value}},
+        '$or': [{sort_field: {'$ne': value}}, {'_id': {'$lt': _id}}]
+    }
+
+def _page_query(query, after):
+    """Combine a list query with a cursor filter."""
+    if set(query) & set(after):
+        return {'$and': [query, after]}
+    return dict(query, **after)
+
+def page_count(total, per_page):
+    """Get the number of pages, or None when the total was not counted."""
+    return (total + per_page - 1) // per_page if total is not None else None
+
+def _page_cursor(collection, query, sort_field, page, per_page, projection, after):
+    """Open the cursor of one page, plus one extra document.
+
+    The extra document tells whether there is a next page without counting.
+    Works the same on pymongo and Motor collections.
+    """
+    sort = [(sort_field, -1), ('_id', -1)]
+    fetch_projection = with_fields(projection, [sort_field])
+
+    if after is not None:
+        value, _id = decode_cursor(after)
+        page_query = _page_query(query, after_filter(sort_field, value, _id))
+        return collection.find(page_query, fetch_projection).sort(sort).limit(per_page + 1)
+    skip = (page - 1) * per_page
+    return collection.find(query, fetch_projection).sort(sort).skip(skip).limit(per_page + 1)
+
+def _check_count_mode(count):
+    """Raise InvalidPagination for an unknown count mode."""
+    if count not in COUNT_MODES:
+        raise InvalidPagination(f"count must be one of: {', '.join(COUNT_MODES)}")
+
+def _next_cursor(documents, per_page, sort_field):
+    """Trim the extra document off a page; returns (documents, next_cursor)."""
+    has_more = len(documents) > per_page
+    documents = documents[:per_page]
+    return documents, encode_cursor(documents[-1], sort_field) if documents and has_more else None
+
+def paginate(collection, query, sort_field, page=1, per_page=10, projection=None, after=None, count='estimated'):
+    """Get one page of documents sorted by sort_field then _id, highest first.
+
+    With an after cursor the page starts right after the document the
+    cursor was built from, so deep pages cost the same as the first one;
+    page is then ignored. count picks how the total is computed (see
+    counts.count_documents). Returns (documents, total, next_cursor), where
+    next_cursor is None on the last page.
+    """
+    _check_count_mode(count)
+    documents = list(_page_cursor(collection, query, sort_field, page, per_page, projection, after))
+    documents, next_cursor = _next_cursor(documents, per_page, sort_field)
+    total = count_documents(collection, query, count)
+    return documents, total, next_cursor
+
+async def async_paginate(collection, query, sort_field, page=1, per_page=10, projection=None, after=None, count='estimated'):
+    """paginate for a Motor collection."""
+    _check_count_mode(count)
+    documents = await _page_cursor(collection, query, sort_field, page, per_page, projection, after).to_list(None)
+    documents, next_cursor = _next_cursor(documents, per_page, sort_field)
+    total = await async_count_documents(collection, query, count)
+    return documents, total, next_cursor
@@ -0,0 +1,36 @@
+"""
+Helpers for models loaded with a find() projection.
+Projections are dicts of top-level field names, as passed to find().
+"""
+
+def _is_inclusion(projection):
+    """Check whether a projection lists the fields to load rather than to skip."""
+    fields = {name: value for name, value in projection.items() if name != '_id'}
+    if fields:
+        return any(fields.values())
+    return bool(projection.get('_id'))
+
+def is_field_loaded(projection, field):
+    """Check whether a projection loads a field.
+
+    No projection loads whole documents. An inclusion projection loads the
+    fields set to a truthy value, an exclusion projection every field but
+    the excluded ones.
+    """
+    if not projection:
+        return True
+    if _is_inclusion(projection):
+        return bool(projection.get(field))
+    return field not in projection
+
+def with_fields(projection, fields):
+    """Extend a projection to also load fields; None once it loads everything."""
+    if not projection:
+        return None
+    projection = dict(projection)
+    if _is_inclusion(projection):
+        projection.update((field, 1) for field in fields)
+        return projection
+    for field in fields:
+        projection.pop(field, None)
+    return projection if any(name != '_id' for name in projection) else None
@@ -1,11 +1,31 @@
 from datetime import datetime
 from bson import ObjectId
+from pymongo import UpdateOne
 from database import get_collection
+from config import Config
+from .projection import is_field_loaded
+from .pagination import page_count, paginate
+from .identity_map import defer, load_by_ids
+from .write_effects import ranking_deleted, ranking_saved, rankings_written
+from .fields import Field
 
 class Ranking:
     """Ranking model for storing candidate-job match scores."""
     
+    __slots__ = ('_data', 'projection')
+    
+    _id = Field()
+    resume_id = Field()
+    job_id = Field()
+    overall_score = Field()
+    score_breakdown = Field()
+    algorithm_version = Field('1.0')
+    confidence_score = Field()
+    created_at = Field()
+    updated_at = Field()
+    
     def __init__(self, resume_id=None, job_id=None, overall_score=None, _id=None, **kwargs):
+        self._data = {}
         self._id = _id or ObjectId()
         
         # Foreign keys - store as ObjectIds
@@ -32,28 +52,31 @@ class Ranking:
         # Timestamps
         self.created_at = kwargs.get('created_at', datetime.utcnow())
         self.updated_at = kwargs.get('updated_at', datetime.utcnow())
+        
+        # Projection the ranking was loaded with; None for a full document
+        self.projection = kwargs.get('projection')
     
     @classmethod
-    def from_dict(cls, data):
-        """Create Ranking instance from dictionary."""
-        return cls(
-            _id=data.get('_id'),
-            resume_id=data.get('resume_id'),
-            job_id=data.get('job_id'),
-            overall_score=data.get('overall_score'),
-            score_breakdown=data.get('score_breakdown'),
-            algorithm_version=data.get('algorithm_version', '1.0'),
-            confidence_score=data.get('confidence_score'),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
-    
-    def save(self):
-        """Save ranking to database."""
-        rankings_collection = get_collection('rankings')
-        self.updated_at = datetime.utcnow()
+    def from_dict(cls, data, projection=None):
+        """Create Ranking instance from dictionary.
         
-        ranking_data = {
+        The dictionary is wrapped, not copied; fields are read from it when
+        they are first accessed.
+        """
+        ranking = cls.__new__(cls)
+        ranking._data = data
+        ranking.projection = projection
+        if not ranking._id:
+            ranking._id = ObjectId()
+        return ranking
+    
+    def is_loaded(self, field):
+        """Check whether a field was loaded from the database."""
+        return is_field_loaded(self.projection, field)
+    
+    def to_document(self):
+        """Get the ranking fields stored in the database."""
+        return {
             'resume_id': self.resume_id,
             'job_id': self.job_id,
             'overall_score': self.overall_score,
@@ -63,6 +86,16 @@ class Ranking:
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
+    
+    def save(self):
+        """Save ranking to database."""
+        if self.projection:
+            raise ValueError('Cannot save a partially loaded ranking')
+        
+        rankings_collection = get_collection('rankings')
+        self.updated_at = datetime.utcnow()
+        
+        ranking_data = self.to_document()
         
         # Check for existing ranking with same resume_id and job_id
         existing = rankings_collection.find_one({
@@ -88,22 +121,115 @@ class Ranking:
             result = rankings_collection.insert_one(ranking_data)
             self._id = result.inserted_id
         
+        ranking_saved(self)
         return self
     
+    def upsert_operation(self, now):
+        """Build the bulk upsert of this ranking on its (resume_id, job_id) key."""
+        self.updated_at = now
+        return UpdateOne(
+            {'resume_id': self.resume_id, 'job_id': self.job_id},
+            {
+                '$set': {
+                    'overall_score': self.overall_score,
+                    'score_breakdown': self.score_breakdown,
+                    'algorithm_version': self.algorithm_version,
+                    'confidence_score': self.confidence_score,
+                    'updated_at': now
+                },
+                '$setOnInsert': {'_id': self._id, 'created_at': self.created_at}
+            },
+            upsert=True
+        )
+    
+    @staticmethod
+    def stored_keys_query(rankings):
+        """Build the find() arguments loading the stored _id and created_at of rankings."""
+        return (
+            {
+                'resume_id': {'$in': list({ranking.resume_id for ranking in rankings})},
+                'job_id': {'$in': list({ranking.job_id for ranking in rankings})}
+            },
+            {'resume_id': 1, 'job_id': 1, 'created_at': 1}
+        )
+    
+    @staticmethod
+    def set_stored_keys(rankings, stored):
+        """Give rankings that already existed their stored _id and created_at."""
+        by_key = {(ranking.resume_id, ranking.job_id): ranking for ranking in rankings}
+        for ranking_data in stored:
+            ranking = by_key.get((ranking_data['resume_id'], ranking_data['job_id']))
+            if ranking:
+                ranking._id = ranking_data['_id']
+                ranking.created_at = ranking_data.get('created_at')
+    
+    @classmethod
+    def bulk_upsert(cls, rankings, batch_size=None, load_stored_keys=True):
+        """Insert or update many rankings with unordered bulk writes.
+        
+        Each batch is one bulk_write of upserts on the unique (resume_id,
+        job_id) index, plus, with load_stored_keys, one find for the _id and
+        created_at of rankings that already existed, which are set on the
+        given models. Callers that discard the models can skip it.
+        """
+        rankings_collection = get_collection('rankings')
+        batch_size = batch_size or Config.get_ranking_config()['write_batch_size']
+        rankings = list(rankings)
+        summary = {'matched': 0, 'modified': 0, 'upserted': 0}
+        
+        for start in range(0, len(rankings), batch_size):
+            batch = rankings[start:start + batch_size]
+            now = datetime.utcnow()
+            
+            operations = [ranking.upsert_operation(now) for ranking in batch]
+            result = rankings_collection.bulk_write(operations, ordered=False)
+            summary['matched'] += result.matched_count
+            summary['modified'] += result.modified_count
+            summary['upserted'] += result.upserted_count
+            
+            # Rankings that already existed keep their stored _id and created_at
+            existing = [ranking for index, ranking in enumerate(batch) if index not in result.upserted_ids]
+            if existing and load_stored_keys:
+                cls.set_stored_keys(existing, rankings_collection.find(*cls.stored_keys_query(existing)))
+        
+        rankings_written()
+        return summary
+    
+    @classmethod
+    def delete_stale(cls, job_id, run_started):
+        """Delete the rankings of a job not written since run_started.
+        
+        Every ranking a ranking run stores is upserted with a newer
+        updated_at, so this leaves exactly the rankings of the latest run.
+        Returns the number of rankings deleted.
+        """
+        rankings_collection = get_collection('rankings')
+        result = rankings_collection.delete_many({'job_id': job_id, 'updated_at': {'$lt': run_started}})
+        rankings_written()
+        return result.deleted_count
+    
     def delete(self):
         """Delete ranking from database."""
         rankings_collection = get_collection('rankings')
         if hasattr(self, '_id') and self._id:
             rankings_collection.delete_one({'_id': self._id})
+            ranking_deleted(self._id)
     
     @classmethod
-    def find_by_id(cls, ranking_id):
-        """Find ranking by ID."""
-        rankings_collection = get_collection('rankings')
+    def find_by_id(cls, ranking_id, projection=None):
+        """Find ranking by ID.
+        
+        Within a request, a ranking already looked up is returned again
+        without a query (see identity_map).
+        """
         if isinstance(ranking_id, str):
             ranking_id = ObjectId(ranking_id)
-        ranking_data = rankings_collection.find_one({'_id': ranking_id})
-        return cls.from_dict(ranking_data) if ranking_data else None
+        return load_by_ids(cls, 'rankings', [ranking_id], projection).get(ranking_id)
+    
+    @classmethod
+    def prefetch(cls, ranking_ids):
+        """Queue rankings to be loaded with the next lookup in this request."""
+        defer('rankings', [ObjectId(ranking_id) if isinstance(ranking_id, str) else ranking_id for ranking_id in ranking_ids])
     
     @classmethod
     def find_by_resume_and_job(cls, resume_id, job_id):
@@ -121,61 +247,82 @@ class Ranking:
         return cls.from_dict(ranking_data) if ranking_data else None
     
     @classmethod
-    def get_by_job(cls, job_id, page=1, per_page=10):
-        """Get rankings for a specific job."""
+    def get_by_job(cls, job_id, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get rankings for a specific job.
+        
+        Pass the returned next_cursor as after to get the following page
+        without skipping over the earlier ones. count is 'exact',
+        'estimated' or 'none' (total and pages are then None).
+        """
         rankings_collection = get_collection('rankings')
         if isinstance(job_id, str):
             job_id = ObjectId(job_id)
         
-        # Calculate skip value for pagination
-        skip = (page - 1) * per_page
-        
         # Get rankings with pagination, sorted by score
-        rankings_cursor = rankings_collection.find({'job_id': job_id}).skip(skip).limit(per_page).sort('overall_score', -1)
-        rankings = [cls.from_dict(ranking_data) for ranking_data in rankings_cursor]
-        
-        # Get total count
-        total = rankings_collection.count_documents({'job_id': job_id})
+        rankings_data, total, next_cursor = paginate(
+            rankings_collection, {'job_id': job_id}, 'overall_score', page, per_page, projection, after, count
+        )
+        rankings = [cls.from_dict(ranking_data, projection) for ranking_data in rankings_data]
         
         return {
             'rankings': rankings,
             'total': total,
             'page': page,
             'per_page': per_page,
-            'pages': (total + per_page - 1) // per_page
+            'pages': page_count(total, per_page),
+            'next_cursor': next_cursor
         }
     
     @classmethod
-    def get_by_resume(cls, resume_id):
-        """Get rankings for a specific resume."""
+    def get_by_resume(cls, resume_id, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get rankings for a specific resume.
+        
+        Pass the returned next_cursor as after to get the following page
+        without skipping over the earlier ones. count is 'exact',
+        'estimated' or 'none' (total and pages are then None).
+        """
         rankings_collection = get_collection('rankings')
         if isinstance(resume_id, str):
             resume_id = ObjectId(resume_id)
-            
-        rankings_cursor = rankings_collection.find({'resume_id': resume_id}).sort('overall_score', -1)
-        return [cls.from_dict(ranking_data) for ranking_data in rankings_cursor]
+        
+        # Get rankings with pagination, sorted by score
+        rankings_data, total, next_cursor = paginate(
+            rankings_collection, {'resume_id': resume_id}, 'overall_score', page, per_page, projection, after, count
+        )
+        rankings = [cls.from_dict(ranking_data, projection) for ranking_data in rankings_data]
+        
+        return {
+            'rankings': rankings,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': page_count(total, per_page),
+            'next_cursor': next_cursor
+        }
     
     @classmethod
-    def get_all(cls, page=1, per_page=10):
-        """Get all rankings with pagination."""
-        rankings_collection = get_collection('rankings')
+    def get_all(cls, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get all rankings with pagination.
         
-        # Calculate skip value for pagination
-        skip = (page - 1) * per_page
+        Pass the returned next_cursor as after to get the following page
+        without skipping over the earlier ones. count is 'exact',
+        'estimated' or 'none' (total and pages are then None).
+        """
+        rankings_collection = get_collection('rankings')
         
         # Get rankings with pagination
-        rankings_cursor = rankings_collection.find().skip(skip).limit(per_page).sort('overall_score', -1)
-        rankings = [cls.from_dict(ranking_data) for ranking_data in rankings_cursor]
-        
-        # Get total count
-        total = rankings_collection.count_documents({})
+        rankings_data, total, next_cursor = paginate(
+            rankings_collection, {}, 'overall_score', page, per_page, projection, after, count
+        )
+        rankings = [cls.from_dict(ranking_data, projection) for ranking_data in rankings_data]
         
         return {
             'rankings': rankings,
             'total': total,
             'page': page,
             'per_page': per_page,
-            'pages': (total + per_page - 1) // per_page
+            'pages': page_count(total, per_page),
+            'next_cursor': next_cursor
         }
     
     def to_dict(self):
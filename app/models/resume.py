@@ -1,12 +1,55 @@
 from datetime import datetime
 from bson import ObjectId
 from database import get_collection
+from ..utils.resume_features import FEATURE_VERSION
+from ..utils.corpus_stats import count_resume, remove_document
+from .projection import is_field_loaded, with_fields
+from .pagination import page_count, paginate
+from .identity_map import defer, load_by_ids
+from .write_effects import counts_in_corpus, resume_deleted, resume_saved
+from .fields import Field
+
+# Fields used by to_dict(include_text=False), for listing resumes alongside other records
+SUMMARY_FIELDS = {
+    'filename': 1, 'original_filename': 1, 'file_size': 1, 'mime_type': 1,
+    'candidate_name': 1, 'candidate_email': 1, 'candidate_phone': 1,
+    'processing_status': 1, 'uploaded_at': 1, 'processed_at': 1,
+    'parsed_data': 1, 'duplicate_of': 1
+}
+
+# Fields ranking reads; the feature source fields are loaded only when needed
+RANKING_FIELDS = {'features': 1, 'duplicate_of': 1}
 
 class Resume:
     """Resume model for storing candidate information."""
     
+    __slots__ = ('_data', 'projection')
+    
+    _id = Field()
+    filename = Field()
+    original_filename = Field()
+    file_path = Field()
+    file_size = Field()
+    mime_type = Field()
+    raw_text = Field()
+    parsed_data = Field()
+    features = Field()
+    corpus_terms = Field()
+    file_hash = Field()
+    minhash = Field()
+    lsh_bands = Field()
+    duplicate_of = Field()
+    candidate_name = Field()
+    candidate_email = Field()
+    candidate_phone = Field()
+    processing_status = Field('pending')
+    error_message = Field()
+    uploaded_at = Field()
+    processed_at = Field()
+    
     def __init__(self, filename=None, original_filename=None, file_path=None, 
                  file_size=None, mime_type=None, _id=None, **kwargs):
+        self._data = {}
         self._id = _id or ObjectId()
         self.filename = filename
         self.original_filename = original_filename
@@ -20,6 +63,19 @@ class Resume:
         # Parsed structured data
         self.parsed_data = kwargs.get('parsed_data')
         
+        # Precomputed ranking features (see utils.resume_features)
+        self.features = kwargs.get('features')
+        
+        # Terms counted in the corpus statistics, None while not counted.
+        # Only written by corpus_stats, never by save()
+        self.corpus_terms = kwargs.get('corpus_terms')
+        
+        # Duplicate detection (see utils.near_duplicates)
+        self.file_hash = kwargs.get('file_hash')
+        self.minhash = kwargs.get('minhash')
+        self.lsh_bands = kwargs.get('lsh_bands')
+        self.duplicate_of = kwargs.get('duplicate_of')
+        
         # Candidate information
         self.candidate_name = kwargs.get('candidate_name')
         self.candidate_email = kwargs.get('candidate_email')
@@ -31,33 +87,31 @@ class Resume:
         
         self.uploaded_at = kwargs.get('uploaded_at', datetime.utcnow())
         self.processed_at = kwargs.get('processed_at')
+        
+        # Projection the resume was loaded with; None for a full document
+        self.projection = kwargs.get('projection')
     
     @classmethod
-    def from_dict(cls, data):
-        """Create Resume instance from dictionary."""
-        return cls(
-            _id=data.get('_id'),
-            filename=data.get('filename'),
-            original_filename=data.get('original_filename'),
-            file_path=data.get('file_path'),
-            file_size=data.get('file_size'),
-            mime_type=data.get('mime_type'),
-            raw_text=data.get('raw_text'),
-            parsed_data=data.get('parsed_data'),
-            candidate_name=data.get('candidate_name'),
-            candidate_email=data.get('candidate_email'),
-            candidate_phone=data.get('candidate_phone'),
-            processing_status=data.get('processing_status', 'pending'),
-            error_message=data.get('error_message'),
-            uploaded_at=data.get('uploaded_at'),
-            processed_at=data.get('processed_at')
-        )
-    
-    def save(self):
-        """Save resume to database."""
-        resumes_collection = get_collection('resumes')
+    def from_dict(cls, data, projection=None):
+        """Create Resume instance from dictionary.
         
-        resume_data = {
+        The dictionary is wrapped, not copied; fields are read from it when
+        they are first accessed.
+        """
+        resume = cls.__new__(cls)
+        resume._data = data
+        resume.projection = projection
+        if not resume._id:
+            resume._id = ObjectId()
+        return resume
+    
+    def is_loaded(self, field):
+        """Check whether a field was loaded from the database."""
+        return is_field_loaded(self.projection, field)
+    
+    def to_document(self):
+        """Get the resume fields stored in the database."""
+        return {
             'filename': self.filename,
             'original_filename': self.original_filename,
             'file_path': self.file_path,
@@ -65,6 +119,11 @@ class Resume:
             'mime_type': self.mime_type,
             'raw_text': self.raw_text,
             'parsed_data': self.parsed_data,
+            'features': self.features,
+            'file_hash': self.file_hash,
+            'minhash': self.minhash,
+            'lsh_bands': self.lsh_bands,
+            'duplicate_of': self.duplicate_of,
             'candidate_name': self.candidate_name,
             'candidate_email': self.candidate_email,
             'candidate_phone': self.candidate_phone,
@@ -73,6 +132,14 @@ class Resume:
             'uploaded_at': self.uploaded_at,
             'processed_at': self.processed_at
         }
+    
+    def save(self):
+        """Save resume to database."""
+        if self.projection:
+            raise ValueError('Cannot save a partially loaded resume')
+        
+        resumes_collection = get_collection('resumes')
+        resume_data = self.to_document()
         
         if hasattr(self, '_id') and self._id:
             # Update existing resume
@@ -85,6 +152,11 @@ class Resume:
             result = resumes_collection.insert_one(resume_data)
             self._id = result.inserted_id
         
+        # Count the resume in the corpus statistics once parsing has completed
+        if counts_in_corpus(self):
+            count_resume(self)
+        
+        resume_saved(self)
         return self
     
     def delete(self):
@@ -93,23 +165,74 @@ class Resume:
         rankings_collection = get_collection('rankings')
         
         if hasattr(self, '_id') and self._id:
+            # Corpus statistics need the stored terms of the resume
+            self.load_fields([self], ('corpus_terms',))
+            
             # Delete associated rankings first
             rankings_collection.delete_many({'resume_id': self._id})
             # Delete resume
-            resumes_collection.delete_one({'_id': self._id})
+            result = resumes_collection.delete_one({'_id': self._id})
+            
+            if result.deleted_count and self.corpus_terms is not None:
+                remove_document(self.corpus_terms)
+            
+            resume_deleted(self._id)
     
     @classmethod
-    def find_by_id(cls, resume_id):
-        """Find resume by ID."""
-        resumes_collection = get_collection('resumes')
+    def find_by_id(cls, resume_id, projection=None):
+        """Find resume by ID.
+        
+        Within a request, a resume already looked up is returned again
+        without a query (see identity_map).
+        """
         if isinstance(resume_id, str):
             resume_id = ObjectId(resume_id)
-        resume_data = resumes_collection.find_one({'_id': resume_id})
-        return cls.from_dict(resume_data) if resume_data else None
+        return load_by_ids(cls, 'resumes', [resume_id], projection).get(resume_id)
+    
+    @classmethod
+    def find_by_ids(cls, resume_ids, projection=None):
+        """Find many resumes with a single query.
+        
+        Returns a dict mapping each found resume's _id to the resume. With a
+        projection, only those fields are loaded.
+        """
+        resume_ids = list({ObjectId(resume_id) if isinstance(resume_id, str) else resume_id for resume_id in resume_ids})
+        if not resume_ids:
+            return {}
+        return load_by_ids(cls, 'resumes', resume_ids, projection)
     
     @classmethod
-    def get_all(cls, status=None, page=1, per_page=10):
-        """Get all resumes with optional filtering and pagination."""
+    def prefetch(cls, resume_ids):
+        """Queue resumes to be loaded with the next lookup in this request."""
+        defer('resumes', [ObjectId(resume_id) if isinstance(resume_id, str) else resume_id for resume_id in resume_ids])
+    
+    @classmethod
+    def load_fields(cls, resumes, fields):
+        """Load fields missing from partially loaded resumes with a single query."""
+        missing = {}
+        for resume in resumes:
+            if not all(resume.is_loaded(field) for field in fields):
+                missing[resume._id] = resume
+        if not missing:
+            return
+        
+        resumes_collection = get_collection('resumes')
+        resumes_cursor = resumes_collection.find({'_id': {'$in': list(missing)}}, {field: 1 for field in fields})
+        for resume_data in resumes_cursor:
+            resume = missing[resume_data['_id']]
+            for field in fields:
+                if not resume.is_loaded(field):
+                    setattr(resume, field, resume_data.get(field))
+            resume.projection = with_fields(resume.projection, fields)
+    
+    @classmethod
+    def get_all(cls, status=None, page=1, per_page=10, projection=None, after=None, count='estimated'):
+        """Get all resumes with optional filtering and pagination.
+        
+        Pass the returned next_cursor as after to get the following page
+        without skipping over the earlier ones. count is 'exact',
+        'estimated' or 'none' (total and pages are then None).
+        """
         resumes_collection = get_collection('resumes')
         
         # Build query
@@ -117,24 +240,62 @@ class Resume:
         if status:
             query['processing_status'] = status
         
-        # Calculate skip value for pagination
-        skip = (page - 1) * per_page
-        
-        # Get resumes with pagination
-        resumes_cursor = resumes_collection.find(query).skip(skip).limit(per_page).sort('uploaded_at', -1)
-        resumes = [cls.from_dict(resume_data) for resume_data in resumes_cursor]
-        
-        # Get total count
-        total = resumes_collection.count_documents(query)
+        # Get resumes with pagination, newest first
+        resumes_data, total, next_cursor = paginate(
+            resumes_collection, query, 'uploaded_at', page, per_page, projection, after, count
+        )
+        resumes = [cls.from_dict(resume_data, projection) for resume_data in resumes_data]
         
         return {
             'resumes': resumes,
             'total': total,
             'page': page,
             'per_page': per_page,
-            'pages': (total + per_page - 1) // per_page
+            'pages': page_count(total, per_page),
+            'next_cursor': next_cursor
         }
     
+    @classmethod
+    def find_by_skills(cls, skills, status=None, projection=None, limit=None):
+        """Find resumes sharing at least one skill, using the features.skills index.
+        
+        Resumes without a current feature record are included as well, since
+        their skills are not in the index yet. With limit, only the newest
+        limit resumes (those get_all would return on its first page of that
+        size) are searched.
+        """
+        resumes_collection = get_collection('resumes')
+        
+        normalized_skills = list({skill.lower() for skill in skills if isinstance(skill, str)})
+        query = {'$or': [
+            {'features.skills': {'$in': normalized_skills}},
+            {'features.version': {'$ne': FEATURE_VERSION}}
+        ]}
+        if status:
+            query['processing_status'] = status
+        
+        if limit is not None:
+            # Ids of the newest resumes, read from the (processing_status, uploaded_at, _id) index
+            status_query = {'processing_status': status} if status else {}
+            newest = resumes_collection.find(status_query, {'_id': 1}).sort(
+                [('uploaded_at', -1), ('_id', -1)]
+            ).limit(limit)
+            query['_id'] = {'$in': [resume_data['_id'] for resume_data in newest]}
+        
+        resumes_cursor = resumes_collection.find(query, with_fields(projection, ['uploaded_at']))
+        
+        # Newest first, like get_all; sorted here since the $or cannot use a sorted index
+        resumes_data = sorted(
+            resumes_cursor,
+            key=lambda resume_data: (
+                resume_data.get('uploaded_at') is not None,
+                resume_data.get('uploaded_at') or datetime.min,
+                resume_data['_id']
+            ),
+            reverse=True
+        )
+        return [cls.from_dict(resume_data, projection) for resume_data in resumes_data]
+    
     def to_dict(self, include_text=True):
         """Convert resume to dictionary."""
         result = {
@@ -149,7 +310,8 @@ class Resume:
             'processing_status': self.processing_status,
             'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
             'processed_at': self.processed_at.isoformat() if self.processed_at else None,
-            'parsed_data': self.parsed_data
+            'parsed_data': self.parsed_data,
+            'duplicate_of': str(self.duplicate_of) if self.duplicate_of else None
         }
         
         if include_text:
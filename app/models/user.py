@@ -2,6 +2,8 @@ from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from bson import ObjectId
 from database import get_collection
+from .identity_map import load_by_ids
+from .write_effects import user_deleted, user_saved
 
 class User:
     """User model for authentication and authorization."""
@@ -39,12 +41,9 @@ class User:
         """Check if provided password matches hash."""
         return check_password_hash(self.password_hash, password)
     
-    def save(self):
-        """Save user to database."""
-        users_collection = get_collection('users')
-        self.updated_at = datetime.utcnow()
-        
-        user_data = {
+    def to_document(self):
+        """Get the user fields stored in the database."""
+        return {
             'email': self.email,
             'password_hash': self.password_hash,
             'role': self.role,
@@ -52,6 +51,13 @@ class User:
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
+    
+    def save(self):
+        """Save user to database."""
+        users_collection = get_collection('users')
+        self.updated_at = datetime.utcnow()
+        
+        user_data = self.to_document()
         
         if hasattr(self, '_id') and self._id:
             # Update existing user
@@ -64,6 +70,7 @@ class User:
             result = users_collection.insert_one(user_data)
             self._id = result.inserted_id
         
+        user_saved(self)
         return self
     
     def delete(self):
@@ -71,6 +78,7 @@ class User:
         users_collection = get_collection('users')
         if hasattr(self, '_id') and self._id:
             users_collection.delete_one({'_id': self._id})
+            user_deleted(self._id)
     
     @classmethod
     def find_by_email(cls, email):
@@ -81,12 +89,10 @@ class User:
     
     @classmethod
     def find_by_id(cls, user_id):
-        """Find user by ID."""
-        users_collection = get_collection('users')
+        """Find user by ID, through the request's identity map."""
         if isinstance(user_id, str):
             user_id = ObjectId(user_id)
-        user_data = users_collection.find_one({'_id': user_id})
-        return cls.from_dict(user_data) if user_data else None
+        return load_by_ids(cls, 'users', [user_id]).get(user_id)
     
     @classmethod
     def get_all(cls):
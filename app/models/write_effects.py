@@ -0,0 +1,64 @@
+"""
+Cache updates that follow model writes.
+Every write to a model collection has to refresh the request's identity
+map, the cached list totals and, for jobs, the compiled scoring profiles.
+The blocking models and their async counterparts (see async_models) both
+call these helpers after their writes, so the two paths stay in step.
+"""
+
+from config import Config
+from ..utils.job_profile import invalidate_job_profile
+from .counts import invalidate_counts
+from .identity_map import forget, remember
+
+def counts_in_corpus(resume):
+    """Check whether saving a resume should count it in the corpus statistics."""
+    return Config.IDF_KEYWORD_SCORING and resume.processing_status == 'completed'
+
+def resume_saved(resume):
+    """Update caches after a resume was saved."""
+    remember('resumes', resume)
+    invalidate_counts('resumes')
+
+def resume_deleted(resume_id):
+    """Update caches after a resume and its rankings were deleted."""
+    forget('resumes', [resume_id])
+    forget('rankings')
+    invalidate_counts('resumes', 'rankings')
+
+def job_saved(job):
+    """Update caches after a job was saved."""
+    # Compiled scoring profile is stale now
+    invalidate_job_profile(job._id)
+    remember('jobs', job)
+    invalidate_counts('jobs')
+
+def job_deleted(job_id):
+    """Update caches after a job and its rankings were deleted."""
+    invalidate_job_profile(job_id)
+    forget('jobs', [job_id])
+    forget('rankings')
+    invalidate_counts('jobs', 'rankings')
+
+def ranking_saved(ranking):
+    """Update caches after a ranking was saved."""
+    remember('rankings', ranking)
+    invalidate_counts('rankings')
+
+def rankings_written():
+    """Update caches after rankings were written in bulk."""
+    forget('rankings')
+    invalidate_counts('rankings')
+
+def ranking_deleted(ranking_id):
+    """Update caches after a ranking was deleted."""
+    forget('rankings', [ranking_id])
+    invalidate_counts('rankings')
+
+def user_saved(user):
+    """Update caches after a user was saved."""
+    remember('users', user)
+
+def user_deleted(user_id):
+    """Update caches after a user was deleted."""
+    forget('users', [user_id])
@@ -7,22 +7,147 @@ from database import get_collection
 
 bp = Blueprint('analytics', __name__)
 
+# Statistic name -> (collection, query) counted by /stats
+STATS_QUERIES = {
+    'resumes': ('resumes', {}),
+    'jobs': ('jobs', {}),
+    'rankings': ('rankings', {}),
+    'active_jobs': ('jobs', {'status': 'active'}),
+    'processed_resumes': ('resumes', {'processing_status': 'completed'}),
+    'failed_resumes': ('resumes', {'processing_status': 'failed'})
+}
+
+# Job statistics
+JOB_STATUS_PIPELINE = [
+    {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+]
+
+# Resume processing statistics
+RESUME_STATUS_PIPELINE = [
+    {"$group": {"_id": "$processing_status", "count": {"$sum": 1}}}
+]
+
+# Top scoring rankings with resume and job info
+TOP_RANKINGS_PIPELINE = [
+    {"$sort": {"overall_score": -1}},
+    {"$limit": 10},
+    {"$lookup": {
+        "from": "resumes",
+        "localField": "resume_id",
+        "foreignField": "_id",
+        "as": "resume"
+    }},
+    {"$lookup": {
+        "from": "jobs",
+        "localField": "job_id",
+        "foreignField": "_id",
+        "as": "job"
+    }},
+    {"$unwind": {"path": "$resume", "preserveNullAndEmptyArrays": True}},
+    {"$unwind": {"path": "$job", "preserveNullAndEmptyArrays": True}},
+    {"$project": {
+        "overall_score": 1,
+        "candidate_name": "$resume.candidate_name",
+        "job_title": "$job.title"
+    }}
+]
+
+# Average scores by job
+AVERAGE_SCORES_PIPELINE = [
+    {"$lookup": {
+        "from": "jobs",
+        "localField": "job_id",
+        "foreignField": "_id",
+        "as": "job"
+    }},
+    {"$unwind": {"path": "$job", "preserveNullAndEmptyArrays": True}},
+    {"$group": {
+        "_id": "$job_id",
+        "job_title": {"$first": "$job.title"},
+        "avg_score": {"$avg": "$overall_score"},
+        "candidate_count": {"$sum": 1}
+    }}
+]
+
+# Resume fields shown for a job's top candidates
+TOP_CANDIDATE_FIELDS = {'candidate_name': 1, 'candidate_email': 1}
+
+# Job performance score ranges
+SCORE_RANGES = [
+    (0.0, 0.2, 'Poor'),
+    (0.2, 0.4, 'Below Average'),
+    (0.4, 0.6, 'Average'),
+    (0.6, 0.8, 'Good'),
+    (0.8, 1.0, 'Excellent')
+]
+
+def build_report(job_stats, resume_stats, top_rankings, avg_scores):
+    """Build the /reports response from the results of its pipelines."""
+    return {
+        'job_statistics': [{'status': stat['_id'], 'count': stat['count']} for stat in job_stats],
+        'resume_statistics': [{'status': stat['_id'], 'count': stat['count']} for stat in resume_stats],
+        'top_rankings': [
+            {
+                'score': ranking['overall_score'],
+                'candidate': ranking.get('candidate_name', 'Unknown'),
+                'job': ranking.get('job_title', 'Unknown')
+            }
+            for ranking in top_rankings
+        ],
+        'average_scores': [
+            {
+                'job': score.get('job_title', 'Unknown'),
+                'avg_score': float(score['avg_score']) if score['avg_score'] else 0,
+                'candidate_count': score['candidate_count']
+            }
+            for score in avg_scores
+        ]
+    }
+
+def build_performance(rankings, top_rankings, top_resumes):
+    """Build the performance of a job from its rankings.
+    
+    top_resumes maps the resume _id of each of top_rankings to the resume.
+    """
+    scores = [r.overall_score for r in rankings]
+    
+    # Score distribution
+    distribution = []
+    for min_score, max_score, label in SCORE_RANGES:
+        count = sum(1 for score in scores if min_score <= score < max_score)
+        distribution.append({
+            'range': label,
+            'count': count,
+            'percentage': (count / len(scores)) * 100 if scores else 0
+        })
+    
+    top_candidates = []
+    for ranking in top_rankings:
+        resume = top_resumes.get(ranking.resume_id)
+        if resume:
+            top_candidates.append({
+                'name': resume.candidate_name or 'Unknown',
+                'email': resume.candidate_email or 'Unknown',
+                'score': ranking.overall_score
+            })
+    
+    return {
+        'total_candidates': len(rankings),
+        'avg_score': sum(scores) / len(scores) if scores else 0,
+        'max_score': max(scores) if scores else 0,
+        'min_score': min(scores) if scores else 0,
+        'score_distribution': distribution,
+        'top_candidates': top_candidates
+    }
+
 @bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_stats():
     """Get basic system statistics."""
     try:
-        resumes_collection = get_collection('resumes')
-        jobs_collection = get_collection('jobs')
-        rankings_collection = get_collection('rankings')
-        
         stats = {
-            'resumes': resumes_collection.count_documents({}),
-            'jobs': jobs_collection.count_documents({}),
-            'rankings': rankings_collection.count_documents({}),
-            'active_jobs': jobs_collection.count_documents({'status': 'active'}),
-            'processed_resumes': resumes_collection.count_documents({'processing_status': 'completed'}),
-            'failed_resumes': resumes_collection.count_documents({'processing_status': 'failed'})
+            name: get_collection(collection_name).count_documents(query)
+            for name, (collection_name, query) in STATS_QUERIES.items()
         }
         
         return jsonify(stats), 200
@@ -40,82 +165,12 @@ def get_reports():
         jobs_collection = get_collection('jobs')
         rankings_collection = get_collection('rankings')
         
-        # Job statistics
-        job_pipeline = [
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
-        ]
-        job_stats = list(jobs_collection.aggregate(job_pipeline))
+        job_stats = list(jobs_collection.aggregate(JOB_STATUS_PIPELINE))
+        resume_stats = list(resumes_collection.aggregate(RESUME_STATUS_PIPELINE))
+        top_rankings = list(rankings_collection.aggregate(TOP_RANKINGS_PIPELINE))
+        avg_scores = list(rankings_collection.aggregate(AVERAGE_SCORES_PIPELINE))
         
-        # Resume processing statistics
-        resume_pipeline = [
-            {"$group": {"_id": "$processing_status", "count": {"$sum": 1}}}
-        ]
-        resume_stats = list(resumes_collection.aggregate(resume_pipeline))
-        
-        # Top scoring rankings with resume and job info
-        top_rankings_pipeline = [
-            {"$sort": {"overall_score": -1}},
-            {"$limit": 10},
-            {"$lookup": {
-                "from": "resumes",
-                "localField": "resume_id",
-                "foreignField": "_id",
-                "as": "resume"
-            }},
-            {"$lookup": {
-                "from": "jobs",
-                "localField": "job_id",
-                "foreignField": "_id",
-                "as": "job"
-            }},
-            {"$unwind": {"path": "$resume", "preserveNullAndEmptyArrays": True}},
-            {"$unwind": {"path": "$job", "preserveNullAndEmptyArrays": True}},
-            {"$project": {
-                "overall_score": 1,
-                "candidate_name": "$resume.candidate_name",
-                "job_title": "$job.title"
-            }}
-        ]
-        top_rankings = list(rankings_collection.aggregate(top_rankings_pipeline))
-        
-        # Average scores by job
-        avg_scores_pipeline = [
-            {"$lookup": {
-                "from": "jobs",
-                "localField": "job_id",
-                "foreignField": "_id",
-                "as": "job"
-            }},
-            {"$unwind": {"path": "$job", "preserveNullAndEmptyArrays": True}},
-            {"$group": {
-                "_id": "$job_id",
-                "job_title": {"$first": "$job.title"},
-                "avg_score": {"$avg": "$overall_score"},
-                "candidate_count": {"$sum": 1}
-            }}
-        ]
-        avg_scores = list(rankings_collection.aggregate(avg_scores_pipeline))
-        
-        return jsonify({
-            'job_statistics': [{'status': stat['_id'], 'count': stat['count']} for stat in job_stats],
-            'resume_statistics': [{'status': stat['_id'], 'count': stat['count']} for stat in resume_stats],
-            'top_rankings': [
-                {
-                    'score': ranking['overall_score'],
-                    'candidate': ranking.get('candidate_name', 'Unknown'),
-                    'job': ranking.get('job_title', 'Unknown')
-                }
-                for ranking in top_rankings
-            ],
-            'average_scores': [
-                {
-                    'job': score.get('job_title', 'Unknown'),
-                    'avg_score': float(score['avg_score']) if score['avg_score'] else 0,
-                    'candidate_count': score['candidate_count']
-                }
-                for score in avg_scores
-            ]
-        }), 200
+        return jsonify(build_report(job_stats, resume_stats, top_rankings, avg_scores)), 200
         
     except Exception as e:
         current_app.logger.error(f"Get reports error: {str(e)}")
@@ -131,7 +186,9 @@ def get_job_performance(job_id):
             return jsonify({'error': 'Job not found'}), 404
         
         # Get all rankings for this job
-        rankings_result = Ranking.get_by_job(job_id, page=1, per_page=1000)  # Get all rankings
+        rankings_result = Ranking.get_by_job(
+            job_id, page=1, per_page=1000, projection={'resume_id': 1, 'overall_score': 1}, count='none'
+        )  # Get all rankings
         rankings = rankings_result['rankings']
         
         if not rankings:
@@ -145,49 +202,16 @@ def get_job_performance(job_id):
                 }
             }), 200
         
-        scores = [r.overall_score for r in rankings]
-        
-        # Score distribution
-        score_ranges = [
-            (0.0, 0.2, 'Poor'),
-            (0.2, 0.4, 'Below Average'),
-            (0.4, 0.6, 'Average'),
-            (0.6, 0.8, 'Good'),
-            (0.8, 1.0, 'Excellent')
-        ]
-        
-        distribution = []
-        for min_score, max_score, label in score_ranges:
-            count = sum(1 for score in scores if min_score <= score < max_score)
-            distribution.append({
-                'range': label,
-                'count': count,
-                'percentage': (count / len(scores)) * 100 if scores else 0
-            })
-        
         # Top candidates - get top 5 rankings with resume info
         top_rankings = sorted(rankings, key=lambda x: x.overall_score, reverse=True)[:5]
-        top_candidates = []
-        
-        for ranking in top_rankings:
-            resume = Resume.find_by_id(ranking.resume_id)
-            if resume:
-                top_candidates.append({
-                    'name': resume.candidate_name or 'Unknown',
-                    'email': resume.candidate_email or 'Unknown',
-                    'score': ranking.overall_score
-                })
+        top_resumes = Resume.find_by_ids(
+            [ranking.resume_id for ranking in top_rankings],
+            projection=TOP_CANDIDATE_FIELDS
+        )
         
         return jsonify({
             'job': job.to_dict(),
-            'performance': {
-                'total_candidates': len(rankings),
-                'avg_score': sum(scores) / len(scores) if scores else 0,
-                'max_score': max(scores) if scores else 0,
-                'min_score': min(scores) if scores else 0,
-                'score_distribution': distribution,
-                'top_candidates': top_candidates
-            }
+            'performance': build_performance(rankings, top_rankings, top_resumes)
         }), 200
         
     except Exception as e:
@@ -0,0 +1,231 @@
+"""
+Async versions of the I/O-heavy rankings and analytics endpoints.
+create_app(async_io=True) puts them in place of the blocking views of the
+same endpoints. Their database calls go through Motor on the shared event
+loop (see utils.event_loop), with independent queries sent concurrently.
+"""
+
+import asyncio
+from functools import wraps
+from flask import request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from database import get_async_collection
+from ..models.async_models import AsyncJob, AsyncRanking, AsyncResume
+from ..models.resume import SUMMARY_FIELDS
+from ..models.pagination import InvalidPagination
+from ..utils.event_loop import run_async
+from .analytics import (
+    STATS_QUERIES, JOB_STATUS_PIPELINE, RESUME_STATUS_PIPELINE, TOP_RANKINGS_PIPELINE,
+    AVERAGE_SCORES_PIPELINE, TOP_CANDIDATE_FIELDS, build_report, build_performance
+)
+
+def on_event_loop(view):
+    """Turn a coroutine view into a view that runs it on the shared event loop."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        return run_async(view(*args, **kwargs))
+    return wrapper
+
+async def _aggregate(collection_name, pipeline):
+    """Run an aggregation pipeline and get all of its results."""
+    return await get_async_collection(collection_name).aggregate(pipeline).to_list(None)
+
+def _page_args():
+    """Get the page, per_page, after and count arguments of a list request."""
+    return {
+        'page': request.args.get('page', 1, type=int),
+        'per_page': request.args.get('per_page', 10, type=int),
+        'after': request.args.get('after'),
+        'count': request.args.get('count', 'estimated')
+    }
+
+# Rankings
+
+@jwt_required()
+@on_event_loop
+async def get_job_rankings(job_id):
+    """Get rankings for a specific job."""
+    try:
+        page_args = _page_args()
+        job, rankings_result = await asyncio.gather(
+            AsyncJob.find_by_id(job_id),
+            AsyncRanking.get_by_job(job_id, **page_args)
+        )
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        # Include resume information, loaded for the whole page in one query
+        resumes = await AsyncResume.find_by_ids(
+            [ranking.resume_id for ranking in rankings_result['rankings']],
+            projection=SUMMARY_FIELDS
+        )
+        result = []
+        for ranking in rankings_result['rankings']:
+            ranking_dict = ranking.to_dict()
+            resume = resumes.get(ranking.resume_id)
+            if resume:
+                ranking_dict['resume'] = resume.to_dict(include_text=False)
+            result.append(ranking_dict)
+
+        return jsonify({
+            'job': job.to_dict(),
+            'rankings': result,
+            'total': rankings_result['total'],
+            'pages': rankings_result['pages'],
+            'current_page': page_args['page'],
+            'next_cursor': rankings_result['next_cursor']
+        }), 200
+
+    except InvalidPagination as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Get job rankings error: {str(e)}")
+        return jsonify({'error': 'Failed to get job rankings'}), 500
+
+@jwt_required()
+@on_event_loop
+async def get_resume_rankings(resume_id):
+    """Get rankings for a specific resume."""
+    try:
+        page_args = _page_args()
+        resume, rankings_result = await asyncio.gather(
+            AsyncResume.find_by_id(resume_id),
+            AsyncRanking.get_by_resume(resume_id, **page_args)
+        )
+        if not resume:
+            return jsonify({'error': 'Resume not found'}), 404
+
+        # Include job information, loaded for the whole page in one query
+        jobs = await AsyncJob.find_by_ids([ranking.job_id for ranking in rankings_result['rankings']])
+        result = []
+        for ranking in rankings_result['rankings']:
+            ranking_dict = ranking.to_dict()
+            job = jobs.get(ranking.job_id)
+            if job:
+                ranking_dict['job'] = job.to_dict()
+            result.append(ranking_dict)
+
+        return jsonify({
+            'resume': resume.to_dict(),
+            'rankings': result,
+            'total': rankings_result['total'],
+            'pages': rankings_result['pages'],
+            'current_page': page_args['page'],
+            'next_cursor': rankings_result['next_cursor']
+        }), 200
+
+    except InvalidPagination as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Get resume rankings error: {str(e)}")
+        return jsonify({'error': 'Failed to get resume rankings'}), 500
+
+@jwt_required()
+@on_event_loop
+async def delete_ranking(ranking_id):
+    """Delete a ranking."""
+    try:
+        ranking = await AsyncRanking.find_by_id(ranking_id)
+        if not ranking:
+            return jsonify({'error': 'Ranking not found'}), 404
+
+        await AsyncRanking.delete(ranking)
+
+        return jsonify({'message': 'Ranking deleted successfully'}), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Delete ranking error: {str(e)}")
+        return jsonify({'error': 'Failed to delete ranking'}), 500
+
+# Analytics
+
+@jwt_required()
+@on_event_loop
+async def get_stats():
+    """Get basic system statistics."""
+    try:
+        totals = await asyncio.gather(*(
+            get_async_collection(collection_name).count_documents(query)
+            for collection_name, query in STATS_QUERIES.values()
+        ))
+
+        return jsonify(dict(zip(STATS_QUERIES, totals))), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Get stats error: {str(e)}")
+        return jsonify({'error': 'Failed to get statistics'}), 500
+
+@jwt_required()
+@on_event_loop
+async def get_reports():
+    """Get detailed analytics reports."""
+    try:
+        job_stats, resume_stats, top_rankings, avg_scores = await asyncio.gather(
+            _aggregate('jobs', JOB_STATUS_PIPELINE),
+            _aggregate('resumes', RESUME_STATUS_PIPELINE),
+            _aggregate('rankings', TOP_RANKINGS_PIPELINE),
+            _aggregate('rankings', AVERAGE_SCORES_PIPELINE)
+        )
+
+        return jsonify(build_report(job_stats, resume_stats, top_rankings, avg_scores)), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Get reports error: {str(e)}")
+        return jsonify({'error': 'Failed to get reports'}), 500
+
+@jwt_required()
+@on_event_loop
+async def get_job_performance(job_id):
+    """Get performance analytics for a specific job."""
+    try:
+        job, rankings_result = await asyncio.gather(
+            AsyncJob.find_by_id(job_id),
+            AsyncRanking.get_by_job(
+                job_id, page=1, per_page=1000, projection={'resume_id': 1, 'overall_score': 1}, count='none'
+            )
+        )
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        rankings = rankings_result['rankings']
+
+        if not rankings:
+            return jsonify({
+                'job': job.to_dict(),
+                'performance': {
+                    'total_candidates': 0,
+                    'avg_score': 0,
+                    'score_distribution': [],
+                    'top_candidates': []
+                }
+            }), 200
+
+        # Top candidates - get top 5 rankings with resume info
+        top_rankings = sorted(rankings, key=lambda x: x.overall_score, reverse=True)[:5]
+        top_resumes = await AsyncResume.find_by_ids(
+            [ranking.resume_id for ranking in top_rankings],
+            projection=TOP_CANDIDATE_FIELDS
+        )
+
+        return jsonify({
+            'job': job.to_dict(),
+            'performance': build_performance(rankings, top_rankings, top_resumes)
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Get job performance error: {str(e)}")
+        return jsonify({'error': 'Failed to get job performance'}), 500
+
+# Endpoint -> async view replacing the blueprint's view
+ASYNC_VIEWS = {
+    'rankings.get_job_rankings': get_job_rankings,
+    'rankings.get_resume_rankings': get_resume_rankings,
+    'rankings.delete_ranking': delete_ranking,
+    'analytics.get_stats': get_stats,
+    'analytics.get_reports': get_reports,
+    'analytics.get_job_performance': get_job_performance
+}
+
+def register_async_views(app):
+    """Serve the endpoints of ASYNC_VIEWS with their async views."""
+    for endpoint, view in ASYNC_VIEWS.items():
+        app.view_functions[endpoint] = view
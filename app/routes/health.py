@@ -1,14 +1,17 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
+from config import Config
 
 bp = Blueprint('health', __name__)
 
 @bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
+    profile = current_app.config.get('STARTUP_PROFILE')
     return jsonify({
         "status": "healthy",
         "message": "HR Resume System API is running",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "startup": profile.to_dict(Config.get_startup_config()['cold_start_budget_ms']) if profile else None
     }), 200
 
 @bp.route('/', methods=['GET'])
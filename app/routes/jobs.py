@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
 from ..models.job import Job
+from ..models.pagination import InvalidPagination
 from datetime import datetime
 
 bp = Blueprint('jobs', __name__)
@@ -13,16 +14,21 @@ def get_jobs():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status', 'active')
+        after = request.args.get('after')
+        count = request.args.get('count', 'estimated')
         
-        result = Job.get_all(status=status, page=page, per_page=per_page)
+        result = Job.get_all(status=status, page=page, per_page=per_page, after=after, count=count)
         
         return jsonify({
             'jobs': [job.to_dict() for job in result['jobs']],
             'total': result['total'],
             'pages': result['pages'],
-            'current_page': page
+            'current_page': page,
+            'next_cursor': result['next_cursor']
         }), 200
         
+    except InvalidPagination as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Get jobs error: {str(e)}")
         return jsonify({'error': 'Failed to get jobs'}), 500
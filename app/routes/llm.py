@@ -1,10 +1,12 @@
 import os
 import json
 import time
+import asyncio
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
-from groq import Groq
+from groq import AsyncGroq, Groq
 from config import Config
+from ..utils.event_loop import run_async
 
 bp = Blueprint('llm', __name__)
 
@@ -15,6 +17,48 @@ OPENAI_MODEL = llm_config['openai_model']
 print(f"DEBUG (llm.py): OPENAI_API_KEY is {OPENAI_API_KEY}")
 
 
+def _completion_request(prompt):
+    """Build the chat completion arguments for a prompt."""
+    return dict(
+        model=OPENAI_MODEL,
+        messages=[
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        temperature=0.2,
+        max_tokens=2048,
+        top_p=1,
+        stream=False,
+    )
+
+
+# AsyncGroq client of the shared event loop, reused so requests share its
+# HTTP connection pool instead of opening new connections each time
+_async_client = None
+_async_client_loop = None
+
+
+def _get_async_client():
+    """Get the AsyncGroq client of the running event loop, creating it on first use.
+
+    Like the Motor client, it is bound to the loop it is created on, so it
+    is only created from the shared loop's thread.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = AsyncGroq(api_key=OPENAI_API_KEY)
+        _async_client_loop = loop
+    return _async_client
+
+
+async def _create_completion_async(prompt):
+    """Send a chat completion request from the shared event loop."""
+    return await _get_async_client().chat.completions.create(**_completion_request(prompt))
+
+
 def call_groq_api(prompt):
     if not OPENAI_API_KEY:
         current_app.logger.error("OPENAI_API_KEY is not set.")
@@ -22,20 +66,12 @@ def call_groq_api(prompt):
 
     try:
         current_app.logger.info(f"Calling Groq API with model: {OPENAI_MODEL}")
-        client = Groq(api_key=OPENAI_API_KEY)
-        completion = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.2,
-            max_tokens=2048,
-            top_p=1,
-            stream=False,
-        )
+        if current_app.config.get('ASYNC_IO'):
+            # Async entry point: the request waits on the shared event loop
+            completion = run_async(_create_completion_async(prompt))
+        else:
+            client = Groq(api_key=OPENAI_API_KEY)
+            completion = client.chat.completions.create(**_completion_request(prompt))
         
         content = completion.choices[0].message.content
         current_app.logger.info(f"LLM response received: {len(content)} characters")
@@ -121,7 +157,10 @@ def match_jobs():
     try:
         # Get available jobs from database
         from ..models.job import Job
-        result = Job.get_all(status=None, page=1, per_page=1000)  # Get all jobs
+        result = Job.get_all(
+            status=None, page=1, per_page=1000,
+            projection={'title': 1, 'description': 1, 'requirements': 1}, count='none'
+        )  # Get all jobs
         jobs = result['jobs']
         
         if not jobs:
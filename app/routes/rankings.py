@@ -1,80 +1,272 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required
-from ..models.resume import Resume
+import json
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..models.user import User
+from ..models.resume import Resume, RANKING_FIELDS, SUMMARY_FIELDS
 from ..models.job import Job
 from ..models.ranking import Ranking
-from ..utils.ranking_algorithm import calculate_ranking
+from ..models.pagination import InvalidPagination
+from ..utils.batch_scoring import score_resume_batch, score_top_k
+from ..utils.parallel_ranking import score_resumes_parallel
+from ..utils.ranking_algorithm import ScoringStats, calculate_score_upper_bound
+from ..utils.job_profile import get_job_profile
+from ..utils.bulk_ranking import rank_all_jobs
+from ..utils.near_duplicates import split_duplicates
+from ..utils.ranking_results import RankingResults
+from config import Config
 
 bp = Blueprint('rankings', __name__)
 
+# Candidates scored per chunk (and per event) when streaming rankings
+STREAM_CHUNK_SIZE = 500
+
+# Newest completed resumes considered for a ranking run
+RANKING_POOL_SIZE = 1000
+
+def _load_ranking_request(data):
+    """Validate a ranking request and load its job and resume pool.
+    
+    Returns (request_data, None) or (None, error_response).
+    """
+    if not data or not data.get('job_id'):
+        return None, (jsonify({'error': 'Job ID is required'}), 400)
+    
+    job_id = data.get('job_id')
+    job = Job.find_by_id(job_id)
+    if not job:
+        return None, (jsonify({'error': 'Job not found'}), 404)
+    
+    # Optional minimum score for candidates to be ranked
+    min_score = data.get('min_score')
+    if min_score is not None and (isinstance(min_score, bool) or not isinstance(min_score, (int, float))):
+        return None, (jsonify({'error': 'min_score must be a number'}), 400)
+    
+    # Optional top-K mode: only the best candidates are scored in full and stored
+    top_k = data.get('top_k', data.get('limit'))
+    if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1):
+        return None, (jsonify({'error': 'top_k must be a positive integer'}), 400)
+    
+    job_skills = (job.requirements or {}).get('skills') or []
+    no_skill_match_bound = calculate_score_upper_bound({'skills': 0.0})
+    
+    if min_score is not None and job_skills and min_score > no_skill_match_bound:
+        # Candidates without any matching skill cannot reach min_score,
+        # so only load the ones of the pool the skill index says overlap with the job
+        resumes = Resume.find_by_skills(
+            job_skills, status='completed', projection=RANKING_FIELDS, limit=RANKING_POOL_SIZE
+        )
+    else:
+        # Get the newest completed resumes
+        result = Resume.get_all(
+            status='completed', page=1, per_page=RANKING_POOL_SIZE, projection=RANKING_FIELDS, count='none'
+        )
+        resumes = result['resumes']
+    
+    if not resumes:
+        return None, (jsonify({'error': 'No processed resumes found'}), 400)
+    
+    # Duplicates whose canonical resume is in the pool reuse its scores
+    resumes, duplicates = split_duplicates(resumes)
+    
+    return {
+        'job': job,
+        'resumes': resumes,
+        'duplicates': duplicates,
+        'min_score': min_score,
+        'top_k': top_k
+    }, None
+
+def _clear_stale_rankings(job, run_started):
+    """Delete the job's rankings the run did not store.
+    
+    Candidates that were pruned, fell below min_score or outside top_k keep
+    no ranking from an earlier run, possibly scored against older job
+    requirements, so the job's rankings are exactly this run's.
+    """
+    return Ranking.delete_stale(job._id, run_started)
+
+def _save_rankings(results, job, min_score=None):
+    """Create or update the rankings for ranked results at or above min_score.
+    
+    Rankings are written with bulk upserts, one batch of models at a time,
+    and only their dicts are kept.
+    """
+    if min_score is not None:
+        results = results.above(min_score)
+    
+    batch_size = Config.get_ranking_config()['write_batch_size']
+    rankings = []
+    
+    for start in range(0, len(results), batch_size):
+        batch = [
+            results.to_ranking(position, job._id)
+            for position in range(start, min(start + batch_size, len(results)))
+        ]
+        Ranking.bulk_upsert(batch, batch_size)
+        rankings.extend(ranking.to_dict() for ranking in batch)
+    
+    return rankings
+
+def _sse_event(event, data):
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @bp.route('/', methods=['POST'])
 @jwt_required()
 def create_rankings():
     """Create rankings for a job."""
     try:
-        data = request.get_json()
-        if not data or not data.get('job_id'):
-            return jsonify({'error': 'Job ID is required'}), 400
-        
-        job_id = data.get('job_id')
-        job = Job.find_by_id(job_id)
-        if not job:
-            return jsonify({'error': 'Job not found'}), 404
+        ranking_request, error = _load_ranking_request(request.get_json())
+        if error:
+            return error
         
-        # Get all completed resumes
-        result = Resume.get_all(status='completed', page=1, per_page=1000)  # Get all completed resumes
-        resumes = result['resumes']
+        job = ranking_request['job']
+        resumes = ranking_request['resumes']
+        min_score = ranking_request['min_score']
+        top_k = ranking_request['top_k']
         
-        if not resumes:
-            return jsonify({'error': 'No processed resumes found'}), 400
+        # Job-side scoring data is compiled once for the whole run
+        run_started = datetime.utcnow()
+        profile = get_job_profile(job)
+        stats = ScoringStats()
         
-        rankings = []
+        if top_k is not None:
+            # Keep a bounded heap of the best top_k candidates
+            results = RankingResults.from_scored(resumes, score_top_k(resumes, profile, top_k, stats=stats))
+        else:
+            # Score all resumes against the job, across a process pool for large pools
+            if len(resumes) >= Config.get_ranking_config()['parallel_threshold']:
+                batch_scores = score_resumes_parallel(resumes, profile, min_score=min_score, stats=stats)
+            else:
+                # Keyword scoring is skipped for candidates that cannot reach min_score
+                batch_scores = score_resume_batch(resumes, profile, min_score=min_score, stats=stats)
+            # Sort by score; results stay as arrays until rows are saved
+            results = RankingResults.ranked(resumes, batch_scores)
         
-        for resume in resumes:
-            try:
-                # Calculate ranking score
-                score_data = calculate_ranking(resume, job)
-                
-                # Check if ranking already exists
-                existing_ranking = Ranking.find_by_resume_and_job(resume.id, job.id)
-                
-                if existing_ranking:
-                    # Update existing ranking
-                    existing_ranking.overall_score = score_data['overall_score']
-                    existing_ranking.score_breakdown = score_data['score_breakdown']
-                    existing_ranking.confidence_score = score_data['confidence_score']
-                    ranking = existing_ranking
-                else:
-                    # Create new ranking
-                    ranking = Ranking(
-                        resume_id=resume.id,
-                        job_id=job.id,
-                        overall_score=score_data['overall_score'],
-                        score_breakdown=score_data['score_breakdown'],
-                        confidence_score=score_data['confidence_score'],
-                        algorithm_version='1.0'
-                    )
-                
-                ranking.save()
-                
-                rankings.append(ranking)
-                
-            except Exception as e:
-                current_app.logger.error(f"Error ranking resume {resume.id}: {str(e)}")
-                continue
+        results = results.with_duplicates(ranking_request['duplicates'])
+        if top_k is not None:
+            results = results.limit(top_k)
         
-        # Sort rankings by score
-        rankings.sort(key=lambda x: x.overall_score, reverse=True)
+        rankings = _save_rankings(results, job, min_score)
+        _clear_stale_rankings(job, run_started)
         
         return jsonify({
             'message': f'Rankings calculated for {len(rankings)} resumes',
-            'rankings': [ranking.to_dict() for ranking in rankings]
+            'rankings': rankings,
+            'scoring_stats': stats.to_dict()
         }), 200
         
     except Exception as e:
         current_app.logger.error(f"Create rankings error: {str(e)}")
         return jsonify({'error': 'Failed to create rankings'}), 500
 
+@bp.route('/stream', methods=['POST'])
+@jwt_required()
+def stream_rankings():
+    """Create rankings for a job, streaming results as Server-Sent Events.
+    
+    Resumes are scored in chunks. Each chunk emits a 'rankings' event with
+    the rankings it saved, or in top-K mode a 'top_k' event with the best
+    candidates so far. A final 'summary' event closes the stream.
+    """
+    try:
+        ranking_request, error = _load_ranking_request(request.get_json())
+        if error:
+            return error
+    except Exception as e:
+        current_app.logger.error(f"Stream rankings error: {str(e)}")
+        return jsonify({'error': 'Failed to create rankings'}), 500
+    
+    job = ranking_request['job']
+    resumes = ranking_request['resumes']
+    duplicates = ranking_request['duplicates']
+    min_score = ranking_request['min_score']
+    top_k = ranking_request['top_k']
+    
+    def generate():
+        try:
+            run_started = datetime.utcnow()
+            profile = get_job_profile(job)
+            stats = ScoringStats()
+            ranked = 0
+            best = []
+            
+            for start in range(0, len(resumes), STREAM_CHUNK_SIZE):
+                chunk = resumes[start:start + STREAM_CHUNK_SIZE]
+                
+                if top_k is not None:
+                    # Merge the chunk's top_k into the best candidates so far
+                    scored = [(start + index, score_data) for index, score_data in score_top_k(chunk, profile, top_k, stats=stats)]
+                    best = sorted(best + scored, key=lambda item: (-item[1]['overall_score'], item[0]))[:top_k]
+                    results = RankingResults.from_scored(resumes, best).with_duplicates(duplicates).limit(top_k)
+                    yield _sse_event('top_k', {
+                        'scored': start + len(chunk),
+                        'total': len(resumes),
+                        'candidates': [
+                            {'resume_id': results.resumes[position].id, **results.ranking_data(position)}
+                            for position in range(len(results))
+                        ]
+                    })
+                    continue
+                
+                batch_scores = score_resume_batch(chunk, profile, min_score=min_score, stats=stats)
+                results = RankingResults(chunk, batch_scores).with_duplicates(duplicates)
+                rankings = _save_rankings(results, job, min_score)
+                ranked += len(rankings)
+                yield _sse_event('rankings', {
+                    'scored': start + len(chunk),
+                    'total': len(resumes),
+                    'rankings': rankings
+                })
+            
+            if top_k is not None:
+                results = RankingResults.from_scored(resumes, best).with_duplicates(duplicates).limit(top_k)
+                rankings = _save_rankings(results, job, min_score)
+                ranked = len(rankings)
+                _clear_stale_rankings(job, run_started)
+                yield _sse_event('summary', {
+                    'message': f'Rankings calculated for {ranked} resumes',
+                    'rankings': rankings,
+                    'scoring_stats': stats.to_dict()
+                })
+            else:
+                _clear_stale_rankings(job, run_started)
+                yield _sse_event('summary', {
+                    'message': f'Rankings calculated for {ranked} resumes',
+                    'scoring_stats': stats.to_dict()
+                })
+            
+        except Exception as e:
+            current_app.logger.error(f"Stream rankings error: {str(e)}")
+            yield _sse_event('error', {'error': 'Failed to create rankings'})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@bp.route('/rank-all', methods=['POST'])
+@jwt_required()
+def rank_all():
+    """Rank every completed resume against every active job (admin only)."""
+    try:
+        user = User.find_by_id(get_jwt_identity())
+        if not user or user.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        
+        summary = rank_all_jobs()
+        
+        return jsonify({
+            'message': f"Created {summary['rankings']} rankings for {summary['jobs']} jobs",
+            **summary
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Rank all jobs error: {str(e)}")
+        return jsonify({'error': 'Failed to rank all jobs'}), 500
+
 @bp.route('/job/<job_id>', methods=['GET'])
 @jwt_required()
 def get_job_rankings(job_id):
@@ -86,16 +278,22 @@ def get_job_rankings(job_id):
         
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        after = request.args.get('after')
+        count = request.args.get('count', 'estimated')
         
-        rankings_result = Ranking.get_by_job(job_id, page=page, per_page=per_page)
+        rankings_result = Ranking.get_by_job(job_id, page=page, per_page=per_page, after=after, count=count)
         
-        # Include resume information
+        # Include resume information, loaded for the whole page in one query
+        resumes = Resume.find_by_ids(
+            [ranking.resume_id for ranking in rankings_result['rankings']],
+            projection=SUMMARY_FIELDS
+        )
         result = []
         for ranking in rankings_result['rankings']:
             ranking_dict = ranking.to_dict()
-            resume = Resume.find_by_id(ranking.resume_id)
+            resume = resumes.get(ranking.resume_id)
             if resume:
-                ranking_dict['resume'] = resume.to_dict()
+                ranking_dict['resume'] = resume.to_dict(include_text=False)
             result.append(ranking_dict)
         
         return jsonify({
@@ -103,9 +301,12 @@ def get_job_rankings(job_id):
             'rankings': result,
             'total': rankings_result['total'],
             'pages': rankings_result['pages'],
-            'current_page': page
+            'current_page': page,
+            'next_cursor': rankings_result['next_cursor']
         }), 200
         
+    except InvalidPagination as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Get job rankings error: {str(e)}")
         return jsonify({'error': 'Failed to get job rankings'}), 500
@@ -119,22 +320,34 @@ def get_resume_rankings(resume_id):
         if not resume:
             return jsonify({'error': 'Resume not found'}), 404
         
-        rankings = Ranking.get_by_resume(resume_id)
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 10, type=int)
+        after = request.args.get('after')
+        count = request.args.get('count', 'estimated')
+        
+        rankings_result = Ranking.get_by_resume(resume_id, page=page, per_page=per_page, after=after, count=count)
         
-        # Include job information
+        # Include job information, loaded for the whole page in one query
+        jobs = Job.find_by_ids([ranking.job_id for ranking in rankings_result['rankings']])
         result = []
-        for ranking in rankings:
+        for ranking in rankings_result['rankings']:
             ranking_dict = ranking.to_dict()
-            job = Job.find_by_id(ranking.job_id)
+            job = jobs.get(ranking.job_id)
             if job:
                 ranking_dict['job'] = job.to_dict()
             result.append(ranking_dict)
         
         return jsonify({
             'resume': resume.to_dict(),
-            'rankings': result
+            'rankings': result,
+            'total': rankings_result['total'],
+            'pages': rankings_result['pages'],
+            'current_page': page,
+            'next_cursor': rankings_result['next_cursor']
         }), 200
         
+    except InvalidPagination as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Get resume rankings error: {str(e)}")
         return jsonify({'error': 'Failed to get resume rankings'}), 500
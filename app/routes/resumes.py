@@ -4,8 +4,12 @@ import logging
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
 from werkzeug.utils import secure_filename
-from ..models.resume import Resume
+from ..models.resume import Resume, SUMMARY_FIELDS
+from ..models.pagination import InvalidPagination
 from ..utils.resume_parser import parse_resume
+from ..utils.near_duplicates import (
+    file_hash, find_canonical_by_hash, find_near_duplicate, lsh_bands, minhash_signature
+)
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -23,14 +27,23 @@ def list_resumes():
     page = request.args.get('page', type=int, default=1)
     per_page = request.args.get('per_page', type=int, default=10)
     status = request.args.get('status')
+    include_text = request.args.get('include_text', 'false').lower() == 'true'
+    after = request.args.get('after')
+    count = request.args.get('count', 'estimated')
     
-    result = Resume.get_all(status=status, page=page, per_page=per_page)
+    # Load only the fields the list view returns
+    projection = dict(SUMMARY_FIELDS, raw_text=1) if include_text else SUMMARY_FIELDS
+    try:
+        result = Resume.get_all(status=status, page=page, per_page=per_page, projection=projection, after=after, count=count)
+    except InvalidPagination as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'resumes': [r.to_dict() for r in result['resumes']],
+        'resumes': [r.to_dict(include_text=include_text) for r in result['resumes']],
         'total': result['total'],
         'pages': result['pages'],
-        'current_page': page
+        'current_page': page,
+        'next_cursor': result['next_cursor']
     }), 200
 
 @bp.route('/', methods=['POST'])
@@ -56,6 +69,7 @@ def upload_resume():
     try:
         file.save(save_path)
         size = os.path.getsize(save_path)
+        digest = file_hash(save_path)
         logger.info(f"Saved file {unique_name} ({size} bytes)")
     except Exception as e:
         logger.error(f"Error saving file: {e}")
@@ -68,6 +82,7 @@ def upload_resume():
         file_path=save_path,
         file_size=size,
         mime_type=file.content_type,
+        file_hash=digest,
         processing_status='processing'
     )
     resume.save()
@@ -75,19 +90,43 @@ def upload_resume():
 
     # Parse resume text
     try:
-        parsed = parse_resume(save_path)
-        raw = parsed.get('raw_text', '')
-        if not raw.strip():
-            raise Exception("No text extracted")
+        canonical = find_canonical_by_hash(digest, exclude_id=resume._id)
+        if canonical:
+            # Same file uploaded before: reuse its parse instead of parsing again
+            resume.raw_text = canonical.raw_text
+            resume.parsed_data = canonical.parsed_data
+            resume.features = canonical.features
+            resume.candidate_name = canonical.candidate_name
+            resume.candidate_email = canonical.candidate_email
+            resume.candidate_phone = canonical.candidate_phone
+            resume.minhash = canonical.minhash
+            resume.lsh_bands = canonical.lsh_bands
+            resume.duplicate_of = canonical.duplicate_of or canonical._id
+        else:
+            parsed = parse_resume(save_path)
+            raw = parsed.get('raw_text', '')
+            if not raw.strip():
+                raise Exception("No text extracted")
+
+            resume.raw_text = raw
+            resume.parsed_data = parsed.get('structured_data', {})
+            resume.features = parsed.get('features')
+            resume.candidate_name = parsed.get('name')
+            resume.candidate_email = parsed.get('email')
+            resume.candidate_phone = parsed.get('phone')
+
+            # Link near-duplicates (e.g. a resubmission with a small edit)
+            signature = minhash_signature(raw)
+            if signature is not None:
+                resume.minhash = signature.tolist()
+                resume.lsh_bands = lsh_bands(signature)
+                resume.duplicate_of = find_near_duplicate(signature, resume.lsh_bands, exclude_id=resume._id)
 
-        resume.raw_text = raw
-        resume.parsed_data = parsed.get('structured_data', {})
-        resume.candidate_name = parsed.get('name')
-        resume.candidate_email = parsed.get('email')
-        resume.candidate_phone = parsed.get('phone')
         resume.processing_status = 'completed'
         resume.processed_at = datetime.utcnow()
         resume.save()
+        if resume.duplicate_of:
+            logger.info(f"Resume ID={resume.id} is a duplicate of ID={resume.duplicate_of}")
         logger.info(f"Resume ID={resume.id} parsed successfully")
         return jsonify({'message': 'Uploaded', 'resume': resume.to_dict(include_text=True)}), 201
 
@@ -0,0 +1,373 @@
+import time
+import heapq
+import numpy as np
+from datetime import datetime
+from .ranking_algorithm import RANKING_WEIGHTS, calculate_ranking
+from .resume_features import get_feature_records, load_feature_sources
+from .job_profile import get_job_profile
+
+# Component order used for weighting (matches calculate_ranking)
+SCORE_COMPONENTS = ('skills', 'experience', 'education', 'keywords')
+
+# Number of candidates given keyword scoring at a time in top-K mode
+TOP_K_BLOCK_SIZE = 256
+
+def calculate_overall_scores(skills, experience, education, keywords):
+    """Calculate confidence and overall score arrays from component score arrays."""
+    components = {
+        'skills': skills,
+        'experience': experience,
+        'education': education,
+        'keywords': keywords
+    }
+
+    # Confidence is the share of components with a non-zero score
+    available = np.zeros(len(skills), dtype=np.int64)
+    for component in SCORE_COMPONENTS:
+        available += components[component] > 0
+    confidence = available / len(SCORE_COMPONENTS)
+
+    # Weighted overall score, accumulated in the same order as calculate_overall_score
+    total_weight = sum(RANKING_WEIGHTS.values())
+    weighted = np.zeros(len(skills))
+    for component in SCORE_COMPONENTS:
+        weighted = weighted + components[component] * RANKING_WEIGHTS[component]
+    overall = np.clip((weighted / total_weight) * confidence, 0.0, 1.0)
+
+    return confidence, overall
+
+class BatchScores:
+    """Component and overall scores for a block of resumes against one job."""
+
+    def __init__(self, skills, experience, education, keywords, fallback=None):
+        self.skills = skills
+        self.experience = experience
+        self.education = education
+        self.keywords = keywords
+        self.confidence, self.overall = calculate_overall_scores(skills, experience, education, keywords)
+
+        # Rows scored through calculate_ranking keep their full result
+        self.fallback = fallback or {}
+        for index, ranking_data in self.fallback.items():
+            breakdown = ranking_data['score_breakdown']
+            for component in SCORE_COMPONENTS:
+                getattr(self, component)[index] = breakdown[component]
+            self.confidence[index] = ranking_data['confidence_score']
+            self.overall[index] = ranking_data['overall_score']
+
+    @classmethod
+    def from_ranking_data(cls, rows):
+        """Wrap calculate_ranking style results as BatchScores."""
+        count = len(rows)
+        return cls(
+            np.zeros(count), np.zeros(count), np.zeros(count), np.zeros(count),
+            fallback=dict(enumerate(rows))
+        )
+
+    def __len__(self):
+        return len(self.overall)
+
+    def ranking_data(self, index, timestamp=None):
+        """Get the calculate_ranking style result for one row."""
+        if index in self.fallback:
+            return self.fallback[index]
+
+        return {
+            'overall_score': float(self.overall[index]),
+            'score_breakdown': {
+                component: float(getattr(self, component)[index])
+                for component in SCORE_COMPONENTS
+            },
+            'confidence_score': float(self.confidence[index]),
+            'weights_used': dict(RANKING_WEIGHTS),
+            'calculation_timestamp': timestamp or datetime.utcnow().isoformat()
+        }
+
+class PreparedBatch:
+    """Cheap component scores for a block of resumes, with keyword scoring deferred."""
+
+    def __init__(self, skills, experience, education, keyword_lists, profile, failed=None):
+        self.skills = skills
+        self.experience = experience
+        self.education = education
+        self.keyword_lists = keyword_lists
+        self.profile = profile
+
+        # Rows that need calculate_ranking, and their results once computed
+        self.failed = failed or []
+        self.fallback = {}
+
+        # Optional ScoringStats receiving keyword stage timings
+        self.stats = None
+
+    def __len__(self):
+        return len(self.skills)
+
+    def keyword_scores(self, indices):
+        """Calculate keyword density scores for the given rows."""
+        start = time.perf_counter()
+        keyword_matches = np.zeros(len(indices))
+        job_keywords = self.profile.keywords
+        keyword_weights = self.profile.keyword_weights
+        if job_keywords:
+            for position, index in enumerate(indices):
+                resume_keywords = self.keyword_lists[index]
+                if not resume_keywords:
+                    continue
+                matched_keywords = job_keywords.intersection(resume_keywords)
+                if keyword_weights is not None:
+                    keyword_matches[position] = sum(keyword_weights[keyword] for keyword in matched_keywords)
+                else:
+                    keyword_matches[position] = len(matched_keywords)
+        keyword_scores = score_keyword_matches(self.profile, keyword_matches)
+
+        if self.stats is not None:
+            self.stats.record('keywords', time.perf_counter() - start, runs=len(indices))
+        return keyword_scores
+
+    def upper_bounds(self):
+        """Best overall score each row can reach, assuming a perfect keyword score."""
+        keyword_bound = np.full(len(self), 1.0 if self.profile.keywords else 0.0)
+        return BatchScores(
+            self.skills.copy(),
+            self.experience.copy(),
+            self.education.copy(),
+            keyword_bound,
+            fallback=self.fallback
+        ).overall
+
+    def scores(self, indices=None, min_score=None):
+        """Get full BatchScores for the given rows (all rows by default).
+
+        With min_score, keyword scoring is skipped for rows that cannot reach
+        it even with a perfect keyword score. Their keyword score is left at
+        0, so their overall score stays below min_score.
+        """
+        if indices is None:
+            indices = np.arange(len(self))
+
+        if min_score is not None:
+            keywords = np.zeros(len(indices))
+            reachable = np.flatnonzero(self.upper_bounds()[indices] >= min_score)
+            keywords[reachable] = self.keyword_scores(indices[reachable])
+            if self.stats is not None:
+                self.stats.skip('keywords', len(indices) - len(reachable))
+        else:
+            keywords = self.keyword_scores(indices)
+
+        fallback = {
+            position: self.fallback[index]
+            for position, index in enumerate(indices.tolist())
+            if index in self.fallback
+        }
+        return BatchScores(
+            self.skills[indices],
+            self.experience[indices],
+            self.education[indices],
+            keywords,
+            fallback=fallback
+        )
+
+def _fallback_scores(resumes, job):
+    """Score every resume through the per-pair path."""
+    load_feature_sources(resumes)
+    return BatchScores.from_ranking_data([calculate_ranking(resume, job) for resume in resumes])
+
+def score_skill_matches(profile, skill_matches):
+    """Calculate the skill match score array from matched job skill counts."""
+    if not profile.skill_count:
+        return np.zeros(len(skill_matches))
+    return np.minimum(skill_matches / profile.skill_count, 1.0)
+
+def score_experience(profile, experience_years, has_experience):
+    """Calculate the experience score array.
+
+    Full score when the requirement is met, the ratio (min 10%) otherwise.
+    """
+    job_experience_required = profile.experience_required
+    if not job_experience_required:
+        return np.full(len(experience_years), 0.5)
+    ratio = np.maximum(experience_years / job_experience_required, 0.1)
+    experience = np.where(experience_years >= job_experience_required, 1.0, ratio)
+    return np.where(has_experience, experience, 0.5)
+
+def score_education(profile, education_levels, has_education):
+    """Calculate the education score array against the required level."""
+    if not profile.education_required:
+        return np.where(has_education, 0.7, 0.3)
+    required_level = profile.required_level
+    if required_level:
+        compared = np.where(
+            education_levels >= required_level, 1.0,
+            np.where(education_levels > 0, education_levels / required_level, 0.3)
+        )
+    else:
+        compared = np.ones(len(education_levels))
+    return np.where(has_education, compared, 0.3)
+
+def score_components(profile, skill_matches, experience_years, has_experience, education_levels, has_education,
+                     stats=None):
+    """Calculate the skills, experience and education score arrays for one job.
+
+    skill_matches counts the job skills each resume has, has_experience marks
+    rows with usable experience years and has_education rows listing any
+    education at all. Each component is timed as its own stage in stats
+    when given.
+    """
+    stage_calls = (
+        ('skills', score_skill_matches, (profile, skill_matches)),
+        ('experience', score_experience, (profile, experience_years, has_experience)),
+        ('education', score_education, (profile, education_levels, has_education))
+    )
+    scores = []
+    for stage, function, args in stage_calls:
+        start = time.perf_counter()
+        scores.append(function(*args))
+        if stats is not None:
+            stats.record(stage, time.perf_counter() - start, runs=len(skill_matches))
+    return tuple(scores)
+
+def score_keyword_matches(profile, keyword_matches):
+    """Calculate the keyword density score array from matched keyword counts.
+
+    With IDF scoring enabled the counts are summed keyword weights.
+    """
+    if not profile.keywords:
+        return np.zeros(len(keyword_matches))
+    return np.minimum(keyword_matches / profile.keyword_total, 1.0)
+
+def prepare_features(feature_records, job, stats=None):
+    """Compute the cheap component scores from a block of resume feature records.
+
+    job may be a Job or its compiled JobProfile. Component stage timings are
+    added to stats when given, and keyword timings once the batch is scored.
+
+    Rows that cannot be scored in batch are listed in the result's failed
+    indices and need the per-pair path. Returns None when the job data
+    cannot be scored in batch.
+    """
+    profile = get_job_profile(job)
+    if profile.batch_error:
+        return None
+
+    count = len(feature_records)
+    skill_matches = np.zeros(count)
+    experience_years = np.zeros(count)
+    has_experience = np.zeros(count, dtype=bool)
+    education_levels = np.zeros(count)
+    has_education = np.zeros(count, dtype=bool)
+    keyword_lists = [None] * count
+    failed = []
+
+    for index, features in enumerate(feature_records):
+        try:
+            if features is None:
+                raise ValueError('Resume features unavailable')
+
+            resume_skills = features['skills']
+            resume_experience = features['experience_years']
+
+            if resume_skills and profile.skills:
+                skill_matches[index] = len(profile.skill_set.intersection(resume_skills))
+
+            if resume_experience and profile.experience_required:
+                if not isinstance(resume_experience, (int, float)):
+                    raise TypeError('Unsupported experience value')
+                experience_years[index] = resume_experience
+                has_experience[index] = True
+
+            education_levels[index] = features['education_level']
+            has_education[index] = features['has_education']
+            keyword_lists[index] = features['keywords']
+        except Exception:
+            failed.append(index)
+
+    skills, experience, education = score_components(
+        profile, skill_matches, experience_years, has_experience, education_levels, has_education, stats
+    )
+    prepared = PreparedBatch(skills, experience, education, keyword_lists, profile, failed)
+    prepared.stats = stats
+    return prepared
+
+def prepare_batch(resumes, job, stats=None):
+    """Compute the cheap component scores for a block of resumes.
+
+    Returns None when the job data cannot be scored in batch. The skills,
+    experience, education and keyword stages are timed in stats when given.
+    """
+    profile = get_job_profile(job)
+    feature_records = get_feature_records(resumes)
+    prepared = prepare_features(feature_records, profile, stats)
+    if prepared is None:
+        return None
+
+    load_feature_sources([resumes[index] for index in prepared.failed])
+    for index in prepared.failed:
+        prepared.fallback[index] = calculate_ranking(resumes[index], profile)
+    return prepared
+
+def score_resume_batch(resumes, job, min_score=None, stats=None):
+    """Score a block of resumes against a job as NumPy arrays.
+
+    Produces the same scores as calling calculate_ranking for every resume.
+    Rows with unexpected data are scored through calculate_ranking itself.
+    With min_score, rows that cannot reach it skip keyword scoring and only
+    their overall score staying below min_score is meaningful.
+    """
+    resumes = list(resumes)
+    profile = get_job_profile(job)
+
+    prepared = prepare_batch(resumes, profile, stats)
+    if prepared is None:
+        return _fallback_scores(resumes, profile)
+
+    return prepared.scores(min_score=min_score)
+
+def score_top_k(resumes, job, k, stats=None):
+    """Score only as much of the pool as needed to find the top k resumes.
+
+    Returns (index, ranking_data) pairs, best first, identical to the first k
+    entries of a full ranking. Keyword density is only calculated for
+    candidates whose best possible score can still beat the current k-th score.
+    """
+    resumes = list(resumes)
+    if k <= 0 or not resumes:
+        return []
+
+    profile = get_job_profile(job)
+    prepared = prepare_batch(resumes, profile, stats)
+    if prepared is None:
+        batch_scores = _fallback_scores(resumes, profile)
+        overall = batch_scores.overall.tolist()
+        order = sorted(range(len(resumes)), key=lambda index: overall[index], reverse=True)[:k]
+        return [(index, batch_scores.ranking_data(index)) for index in order]
+
+    # Visit candidates from the best possible score down
+    bounds = prepared.upper_bounds()
+    candidate_order = np.argsort(-bounds, kind='stable')
+
+    # Min-heap of (score, -index, ranking_data); the root is the current k-th best
+    heap = []
+    keyword_scored = 0
+    for start in range(0, len(candidate_order), TOP_K_BLOCK_SIZE):
+        block = candidate_order[start:start + TOP_K_BLOCK_SIZE]
+        if len(heap) == k:
+            # Drop candidates whose bound cannot beat the k-th score
+            block = block[bounds[block] >= heap[0][0]]
+            if not len(block):
+                break
+
+        block_scores = prepared.scores(block)
+        keyword_scored += len(block)
+        for position, index in enumerate(block.tolist()):
+            entry = (float(block_scores.overall[position]), -index)
+            if len(heap) < k:
+                heapq.heappush(heap, entry + (block_scores.ranking_data(position),))
+            elif entry > heap[0][:2]:
+                heapq.heapreplace(heap, entry + (block_scores.ranking_data(position),))
+
+    if stats is not None:
+        stats.skip('keywords', len(resumes) - keyword_scored)
+
+    heap.sort(reverse=True)
+    return [(-negative_index, ranking_data) for _, negative_index, ranking_data in heap]
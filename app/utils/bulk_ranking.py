@@ -0,0 +1,164 @@
+import itertools
+import numpy as np
+from scipy import sparse
+from database import get_collection
+from config import Config
+from ..models.job import Job
+from ..models.resume import Resume, RANKING_FIELDS
+from ..models.ranking import Ranking
+from .ranking_algorithm import ALGORITHM_VERSION, calculate_ranking
+from .resume_features import get_feature_records, load_feature_sources
+from .job_profile import get_job_profile
+from .tokenizer import Vocabulary
+from .near_duplicates import split_duplicates
+from .batch_scoring import BatchScores, score_components, score_keyword_matches, score_resume_batch
+
+# Number of jobs whose match counts are materialized at a time
+JOB_BLOCK_SIZE = 64
+
+def _incidence_matrix(token_lists, vocabulary, add_missing=True, row_weights=None):
+    """Build a sparse row x token matrix from lists of unique tokens.
+
+    Entries are 1, or the token's integer weight for rows that have a
+    weights dict in row_weights.
+    """
+    ids, offsets = vocabulary.encode_many(token_lists, add_missing=add_missing)
+    if row_weights is not None:
+        data = np.fromiter(
+            (
+                weights[token] if weights is not None else 1
+                for tokens, weights in zip(token_lists, row_weights)
+                for token in tokens
+            ),
+            dtype=np.int64, count=len(ids)
+        )
+    else:
+        data = np.ones(len(ids), dtype=np.int64)
+    return sparse.csr_matrix((data, ids, offsets), shape=(len(token_lists), len(vocabulary)))
+
+def _load_resumes():
+    """Load all completed resumes with only the fields ranking reads."""
+    resumes_cursor = get_collection('resumes').find({'processing_status': 'completed'}, RANKING_FIELDS)
+    return [Resume.from_dict(resume_data, RANKING_FIELDS) for resume_data in resumes_cursor]
+
+def _is_regular(features):
+    """Check whether a feature record can be scored in the sparse pass."""
+    if features is None:
+        return False
+    experience = features['experience_years']
+    return not experience or isinstance(experience, (int, float))
+
+def _job_rankings(resumes, job_id, batch_scores, duplicates=None):
+    """Generate the Ranking models for one job's scores.
+
+    Resumes listed in duplicates under a scored resume's _id get its scores.
+    """
+    duplicates = duplicates or {}
+    for index, resume in enumerate(resumes):
+        ranking_data = batch_scores.ranking_data(index)
+        for resume_id in [resume._id] + [duplicate._id for duplicate in duplicates.get(resume._id, [])]:
+            yield Ranking(
+                resume_id=resume_id,
+                job_id=job_id,
+                overall_score=ranking_data['overall_score'],
+                score_breakdown=ranking_data['score_breakdown'],
+                confidence_score=ranking_data['confidence_score'],
+                algorithm_version=ALGORITHM_VERSION
+            )
+
+def _write_rankings(rankings):
+    """Upsert rankings from an iterable, one write batch in memory at a time.
+
+    Returns the number of rankings written.
+    """
+    batch_size = Config.get_ranking_config()['write_batch_size']
+    rankings = iter(rankings)
+    written = 0
+    while True:
+        batch = list(itertools.islice(rankings, batch_size))
+        if not batch:
+            return written
+        Ranking.bulk_upsert(batch, batch_size, load_stored_keys=False)
+        written += len(batch)
+
+def rank_all_jobs():
+    """Rank every completed resume against every active job in one pass.
+
+    Resume skills and keywords are turned into sparse resume x skill and
+    resume x keyword matrices once, and all jobs are scored with sparse
+    matrix products. Scores are identical to POST /api/rankings.
+    """
+    jobs = [Job.from_dict(job_data) for job_data in get_collection('jobs').find({'status': 'active'})]
+    resumes = _load_resumes()
+    summary = {'jobs': len(jobs), 'resumes': len(resumes), 'rankings': 0}
+    if not jobs or not resumes:
+        return summary
+
+    # Duplicates whose canonical resume is loaded reuse its scores
+    resumes, duplicates = split_duplicates(resumes)
+
+    profiles = [get_job_profile(job) for job in jobs]
+    scorable = [profile for profile in profiles if not profile.batch_error]
+
+    # Resume-side arrays; irregular rows go through calculate_ranking for every job
+    feature_records = get_feature_records(resumes)
+    irregular = [index for index, features in enumerate(feature_records) if not _is_regular(features)]
+    load_feature_sources([resumes[index] for index in irregular])
+    for index in irregular:
+        feature_records[index] = None
+
+    count = len(resumes)
+    experience_years = np.zeros(count)
+    has_experience = np.zeros(count, dtype=bool)
+    education_levels = np.zeros(count)
+    has_education = np.zeros(count, dtype=bool)
+    for index, features in enumerate(feature_records):
+        if features is None:
+            continue
+        if features['experience_years']:
+            experience_years[index] = features['experience_years']
+            has_experience[index] = True
+        education_levels[index] = features['education_level']
+        has_education[index] = features['has_education']
+
+    # Job vocabularies first, so resume tokens no job uses are dropped
+    skill_vocabulary = Vocabulary()
+    keyword_vocabulary = Vocabulary()
+    job_skills = _incidence_matrix([sorted(profile.skill_set) for profile in scorable], skill_vocabulary)
+    job_keywords = _incidence_matrix(
+        [sorted(profile.keywords) for profile in scorable], keyword_vocabulary,
+        row_weights=[profile.keyword_weights for profile in scorable]
+    )
+    resume_skills = _incidence_matrix(
+        [features['skills'] if features else () for features in feature_records],
+        skill_vocabulary, add_missing=False
+    )
+    resume_keywords = _incidence_matrix(
+        [features['keywords'] if features else () for features in feature_records],
+        keyword_vocabulary, add_missing=False
+    )
+
+    for start in range(0, len(scorable), JOB_BLOCK_SIZE):
+        block = scorable[start:start + JOB_BLOCK_SIZE]
+        skill_counts = (resume_skills @ job_skills[start:start + JOB_BLOCK_SIZE].T).toarray()
+        keyword_counts = (resume_keywords @ job_keywords[start:start + JOB_BLOCK_SIZE].T).toarray()
+
+        for column, profile in enumerate(block):
+            skills, experience, education = score_components(
+                profile, skill_counts[:, column].astype(float),
+                experience_years, has_experience, education_levels, has_education
+            )
+            keywords = score_keyword_matches(profile, keyword_counts[:, column].astype(float))
+            fallback = {index: calculate_ranking(resumes[index], profile) for index in irregular}
+            batch_scores = BatchScores(skills, experience, education, keywords, fallback=fallback)
+            summary['rankings'] += _write_rankings(_job_rankings(resumes, profile.job_id, batch_scores, duplicates))
+
+    # Jobs that cannot be scored in batch use the per-pair path
+    failed_profiles = [profile for profile in profiles if profile.batch_error]
+    if failed_profiles:
+        load_feature_sources(resumes)
+    for profile in failed_profiles:
+        batch_scores = score_resume_batch(resumes, profile)
+        summary['rankings'] += _write_rankings(_job_rankings(resumes, profile.job_id, batch_scores, duplicates))
+
+    return summary
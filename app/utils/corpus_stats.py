@@ -0,0 +1,202 @@
+import math
+import time
+import itertools
+import threading
+from collections import Counter
+from pymongo import UpdateOne
+from database import get_async_collection, get_collection
+from config import Config
+
+# One document per term: {'_id': term, 'df': number of resumes containing it}
+STATS_COLLECTION = 'corpus_stats'
+
+# Document holding the number of counted resumes; never a valid token
+DOCUMENT_COUNT_KEY = '_documents'
+
+# IDF weights are kept as integers at this scale, so weighted keyword sums
+# are exact and do not depend on summation order
+IDF_WEIGHT_SCALE = 1000
+
+def _frequency_updates(terms, delta):
+    """Build the upserts adding delta to each term and to the document count."""
+    operations = [UpdateOne({'_id': term}, {'$inc': {'df': delta}}, upsert=True) for term in terms]
+    operations.append(UpdateOne({'_id': DOCUMENT_COUNT_KEY}, {'$inc': {'df': delta}}, upsert=True))
+    return operations
+
+def _update_document_frequencies(terms, delta):
+    """Add delta to the document frequency of each term and to the document count."""
+    terms = list(terms)
+    stats_collection = get_collection(STATS_COLLECTION)
+    stats_collection.bulk_write(_frequency_updates(terms, delta), ordered=False)
+
+    if delta < 0 and terms:
+        stats_collection.delete_many({'_id': {'$in': terms}, 'df': {'$lte': 0}})
+
+async def _async_update_document_frequencies(terms, delta):
+    """_update_document_frequencies through Motor."""
+    terms = list(terms)
+    stats_collection = get_async_collection(STATS_COLLECTION)
+    await stats_collection.bulk_write(_frequency_updates(terms, delta), ordered=False)
+
+    if delta < 0 and terms:
+        await stats_collection.delete_many({'_id': {'$in': terms}, 'df': {'$lte': 0}})
+
+def add_document(terms):
+    """Count a resume's unique terms in the corpus statistics."""
+    _update_document_frequencies(terms, 1)
+
+def remove_document(terms):
+    """Remove a previously counted resume's terms from the corpus statistics."""
+    _update_document_frequencies(terms, -1)
+
+async def async_add_document(terms):
+    """add_document through Motor."""
+    await _async_update_document_frequencies(terms, 1)
+
+async def async_remove_document(terms):
+    """remove_document through Motor."""
+    await _async_update_document_frequencies(terms, -1)
+
+def _uncounted_resume_terms(resume):
+    """Get the terms to count for a resume, or None when there is nothing to count."""
+    from .resume_features import get_resume_features
+
+    if resume.corpus_terms is not None:
+        return None
+    features = get_resume_features(resume)
+    return list(features['keywords']) if features is not None else None
+
+def count_resume(resume):
+    """Count a stored resume's terms in the corpus statistics, once.
+
+    The resume is claimed by storing the terms counted as its corpus_terms,
+    so a resume is only counted once however often it is saved, and its
+    removal subtracts exactly these terms even after a feature version
+    change. Returns whether the resume was counted by this call.
+    """
+    terms = _uncounted_resume_terms(resume)
+    if terms is None:
+        return False
+
+    resumes_collection = get_collection('resumes')
+    claimed = resumes_collection.update_one({'_id': resume._id, 'corpus_terms': None}, {'$set': {'corpus_terms': terms}})
+    if not claimed.modified_count:
+        return False
+    try:
+        add_document(terms)
+    except Exception:
+        resumes_collection.update_one({'_id': resume._id}, {'$set': {'corpus_terms': None}})
+        raise
+    resume.corpus_terms = terms
+    return True
+
+async def async_count_resume(resume):
+    """count_resume through Motor."""
+    terms = _uncounted_resume_terms(resume)
+    if terms is None:
+        return False
+
+    resumes_collection = get_async_collection('resumes')
+    claimed = await resumes_collection.update_one({'_id': resume._id, 'corpus_terms': None}, {'$set': {'corpus_terms': terms}})
+    if not claimed.modified_count:
+        return False
+    try:
+        await async_add_document(terms)
+    except Exception:
+        await resumes_collection.update_one({'_id': resume._id}, {'$set': {'corpus_terms': None}})
+        raise
+    resume.corpus_terms = terms
+    return True
+
+def rebuild_corpus_stats():
+    """Recount document frequencies from all completed resumes.
+
+    Returns the number of resumes counted.
+    """
+    from ..models.resume import Resume
+    from ..models.identity_map import forget
+    from .resume_features import get_resume_features
+
+    resumes_collection = get_collection('resumes')
+    document_frequencies = Counter()
+    counted = []
+    for resume_data in resumes_collection.find({'processing_status': 'completed'}):
+        features = get_resume_features(Resume.from_dict(resume_data))
+        if features is None:
+            continue
+        terms = list(features['keywords'])
+        document_frequencies.update(terms)
+        counted.append(UpdateOne({'_id': resume_data['_id']}, {'$set': {'corpus_terms': terms}}))
+
+    stats_collection = get_collection(STATS_COLLECTION)
+    stats_collection.delete_many({})
+    documents = [{'_id': term, 'df': df} for term, df in document_frequencies.items()]
+    documents.append({'_id': DOCUMENT_COUNT_KEY, 'df': len(counted)})
+    stats_collection.insert_many(documents)
+
+    resumes_collection.update_many({}, {'$set': {'corpus_terms': None}})
+    batch_size = Config.get_ranking_config()['write_batch_size']
+    for start in range(0, len(counted), batch_size):
+        resumes_collection.bulk_write(counted[start:start + batch_size], ordered=False)
+    forget('resumes')
+    invalidate_idf_table()
+    return len(counted)
+
+_table_versions = itertools.count(1)
+
+class IdfTable:
+    """Snapshot of the corpus document frequencies with smoothed IDF weights."""
+
+    def __init__(self, document_frequencies, document_count):
+        self.document_frequencies = document_frequencies
+        self.document_count = document_count
+        self.version = next(_table_versions)
+        self.loaded_at = time.monotonic()
+
+    def idf(self, term):
+        """Get the smoothed inverse document frequency of a term."""
+        df = self.document_frequencies.get(term, 0)
+        return math.log((1 + self.document_count) / (1 + df)) + 1.0
+
+    def term_weight(self, term):
+        """Get the integer IDF weight of a term (always at least 1)."""
+        return max(int(round(self.idf(term) * IDF_WEIGHT_SCALE)), 1)
+
+    def term_weights(self, terms):
+        """Get integer IDF weights for a set of terms."""
+        return {term: self.term_weight(term) for term in terms}
+
+    def __repr__(self):
+        return f'<IdfTable v{self.version} {self.document_count} documents>'
+
+# Per-process cached table, reloaded after Config.IDF_CACHE_TTL seconds
+_idf_table = None
+_idf_table_lock = threading.Lock()
+
+def _load_idf_table():
+    """Load the current document frequencies from the database."""
+    document_frequencies = {}
+    document_count = 0
+    for stats in get_collection(STATS_COLLECTION).find({}, {'df': 1}):
+        if stats['_id'] == DOCUMENT_COUNT_KEY:
+            document_count = stats['df']
+        else:
+            document_frequencies[stats['_id']] = stats['df']
+    return IdfTable(document_frequencies, document_count)
+
+def get_idf_table():
+    """Get the cached IDF table, or None when IDF keyword scoring is disabled."""
+    global _idf_table
+    if not Config.IDF_KEYWORD_SCORING:
+        return None
+
+    with _idf_table_lock:
+        if _idf_table is None or time.monotonic() - _idf_table.loaded_at > Config.IDF_CACHE_TTL:
+            _idf_table = _load_idf_table()
+        return _idf_table
+
+def invalidate_idf_table():
+    """Drop the cached IDF table so the next lookup reloads it."""
+    global _idf_table
+    with _idf_table_lock:
+        _idf_table = None
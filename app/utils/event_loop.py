@@ -0,0 +1,37 @@
+"""
+Shared asyncio event loop for the async app entry point.
+One loop per process runs in a background thread. Request threads hand it
+their database and LLM calls with run_async and wait for the result, so
+the I/O of every in-flight request is multiplexed on that loop, and
+independent calls within a request can run concurrently.
+"""
+
+import asyncio
+import os
+import threading
+
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+def get_event_loop():
+    """Get the shared event loop, starting its thread on first use.
+
+    A forked worker process starts its own loop, since the parent's loop
+    thread does not survive the fork.
+    """
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name='event-loop', daemon=True).start()
+        return _loop
+
+def run_async(coroutine):
+    """Run a coroutine on the shared event loop and wait for its result.
+
+    The coroutine runs in a copy of the caller's context, so the Flask app
+    and request are available in it as usual.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, get_event_loop()).result()
@@ -0,0 +1,109 @@
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from config import Config
+from .ranking_algorithm import extract_education_level
+from .tokenizer import keyword_set
+from .corpus_stats import get_idf_table
+
+def _job_version(job):
+    """Get the job's updated_at at the millisecond precision MongoDB stores."""
+    updated_at = getattr(job, 'updated_at', None)
+    if isinstance(updated_at, datetime):
+        return updated_at.replace(microsecond=updated_at.microsecond // 1000 * 1000)
+    return updated_at
+
+class JobProfile:
+    """Job-side scoring data compiled once per job version.
+
+    Exposes requirements and description like a Job, so it can also be passed
+    to calculate_ranking for the per-pair path.
+    """
+
+    def __init__(self, job):
+        self.job_id = getattr(job, '_id', None)
+        self.version = _job_version(job)
+        self.requirements = job.requirements
+        self.description = job.description
+
+        # Set when the job data cannot be scored in batch
+        self.batch_error = None
+        self.keywords = set()
+
+        # IDF weights of the job keywords (None when IDF scoring is disabled)
+        idf_table = get_idf_table()
+        self.idf_version = idf_table.version if idf_table else None
+        self.keyword_weights = None
+
+        try:
+            job_requirements = self.requirements or {}
+            self.skills = job_requirements.get('skills', [])
+            self.experience_required = job_requirements.get('experience_years', 0)
+            self.education_required = job_requirements.get('education', "")
+            job_description = self.description or ""
+
+            self.skill_set = set(skill.lower() for skill in self.skills) if self.skills else set()
+            self.skill_count = len(self.skills) if self.skills else 0
+            if self.experience_required and not isinstance(self.experience_required, (int, float)):
+                raise TypeError('Unsupported experience requirement')
+            self.required_level = extract_education_level([self.education_required]) if self.education_required else 0
+            self.keywords = keyword_set(job_description) if job_description else set()
+            if idf_table is not None:
+                self.keyword_weights = idf_table.term_weights(self.keywords)
+        except Exception as e:
+            self.batch_error = str(e)
+
+    @property
+    def keyword_total(self):
+        """Total keyword weight a resume can match."""
+        if self.keyword_weights is not None:
+            return sum(self.keyword_weights.values())
+        return len(self.keywords)
+
+    def __repr__(self):
+        return f'<JobProfile {self.job_id}>'
+
+def _idf_version():
+    """Get the version of the current IDF table, if IDF scoring is enabled."""
+    idf_table = get_idf_table()
+    return idf_table.version if idf_table else None
+
+# Per-process LRU of compiled profiles: job _id -> JobProfile
+_profile_cache = OrderedDict()
+_profile_cache_lock = threading.Lock()
+
+def get_job_profile(job):
+    """Get the compiled profile for a job, reusing it while the job is unchanged.
+
+    Profiles are cached by job _id and rebuilt when updated_at or the IDF
+    table changes. JobProfile instances are returned as they are.
+    """
+    if isinstance(job, JobProfile):
+        return job
+
+    job_id = getattr(job, '_id', None)
+    if job_id is None:
+        return JobProfile(job)
+
+    with _profile_cache_lock:
+        profile = _profile_cache.get(job_id)
+        if (profile is not None and profile.version == _job_version(job)
+                and profile.idf_version == _idf_version()):
+            _profile_cache.move_to_end(job_id)
+            return profile
+
+    profile = JobProfile(job)
+    cache_size = Config.get_ranking_config()['job_profile_cache_size']
+
+    with _profile_cache_lock:
+        _profile_cache[job_id] = profile
+        _profile_cache.move_to_end(job_id)
+        while len(_profile_cache) > cache_size:
+            _profile_cache.popitem(last=False)
+
+    return profile
+
+def invalidate_job_profile(job_id):
+    """Drop the cached profile for a job."""
+    with _profile_cache_lock:
+        _profile_cache.pop(job_id, None)
@@ -0,0 +1,110 @@
+import hashlib
+import numpy as np
+from database import get_collection
+from .tokenizer import tokenize
+
+# MinHash signature length and its split into LSH bands (bands * rows)
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+# Estimated Jaccard similarity at which a resume counts as a near-duplicate
+SIMILARITY_THRESHOLD = 0.9
+
+# Word n-grams hashed into the signature
+SHINGLE_SIZE = 3
+
+# Hash family (a * x + b) mod p; the seed is fixed so stored signatures stay comparable
+_MERSENNE_PRIME = (1 << 31) - 1
+_random = np.random.RandomState(1)
+_hash_a = _random.randint(1, _MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.int64)
+_hash_b = _random.randint(0, _MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.int64)
+
+def file_hash(file_path):
+    """Get the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _shingle_hashes(text):
+    """Hash the word shingles of a text to 32-bit integers."""
+    tokens = tokenize(text or "")
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {' '.join(tokens)} if tokens else set()
+    else:
+        shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), 'little') for shingle in shingles),
+        dtype=np.int64, count=len(shingles)
+    )
+
+def minhash_signature(text):
+    """Compute the MinHash signature of a text, or None if it has no words."""
+    hashes = _shingle_hashes(text) % _MERSENNE_PRIME
+    if not len(hashes):
+        return None
+
+    # Rows are permutations, columns are shingles
+    permuted = (np.outer(_hash_a, hashes) + _hash_b[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1)
+
+def lsh_bands(signature):
+    """Get the LSH band keys of a signature; similar texts share at least one."""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = np.asarray(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS], dtype=np.int64)
+        keys.append(f'{band}:{hashlib.blake2b(rows.tobytes(), digest_size=8).hexdigest()}')
+    return keys
+
+def estimate_similarity(signature, other):
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return float(np.mean(np.asarray(signature) == np.asarray(other)))
+
+def find_canonical_by_hash(digest, exclude_id=None):
+    """Find a completed resume uploaded from an identical file."""
+    from ..models.resume import Resume
+
+    query = {'file_hash': digest, 'processing_status': 'completed'}
+    if exclude_id is not None:
+        query['_id'] = {'$ne': exclude_id}
+    resume_data = get_collection('resumes').find_one(query)
+    return Resume.from_dict(resume_data) if resume_data else None
+
+def find_near_duplicate(signature, bands, exclude_id=None):
+    """Find the canonical resume a signature is a near-duplicate of.
+
+    Candidates come from the LSH band index and are confirmed by estimated
+    similarity. Returns the canonical resume _id or None.
+    """
+    query = {'lsh_bands': {'$in': bands}, 'processing_status': 'completed'}
+    if exclude_id is not None:
+        query['_id'] = {'$ne': exclude_id}
+
+    best_id, best_similarity = None, SIMILARITY_THRESHOLD
+    cursor = get_collection('resumes').find(query, {'minhash': 1, 'duplicate_of': 1})
+    for candidate in cursor:
+        if not candidate.get('minhash'):
+            continue
+        similarity = estimate_similarity(signature, candidate['minhash'])
+        if similarity >= best_similarity:
+            best_id = candidate.get('duplicate_of') or candidate['_id']
+            best_similarity = similarity
+    return best_id
+
+def split_duplicates(resumes):
+    """Separate resumes whose canonical resume is also in the list.
+
+    Returns (unique, duplicates) where duplicates maps a canonical resume _id
+    to the resumes that can reuse its scores.
+    """
+    canonical_ids = {resume._id for resume in resumes if not resume.duplicate_of}
+    unique = []
+    duplicates = {}
+    for resume in resumes:
+        if resume.duplicate_of and resume.duplicate_of in canonical_ids:
+            duplicates.setdefault(resume.duplicate_of, []).append(resume)
+        else:
+            unique.append(resume)
+    return unique, duplicates
@@ -0,0 +1,97 @@
+import os
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
+from .ranking_algorithm import ScoringStats, calculate_ranking
+from .resume_features import get_feature_records, load_feature_sources
+from .batch_scoring import BatchScores, prepare_features, score_resume_batch
+from .job_profile import get_job_profile
+
+# Process pool shared by all ranking runs in this worker
+_executor = None
+_executor_workers = 0
+
+def _get_executor(max_workers):
+    """Get the shared process pool, (re)creating it for a new worker count.
+
+    Pool workers are started with spawn rather than fork: the web worker is
+    threaded and holds an open MongoClient, neither of which is fork-safe.
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != max_workers:
+        _reset_executor()
+        _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        _executor_workers = max_workers
+    return _executor
+
+def _reset_executor():
+    """Shut the shared process pool down, so the next run starts a new one."""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _executor_workers = 0
+
+def _score_feature_chunk(profile, feature_records, min_score=None):
+    """Score a chunk of feature records inside a pool worker."""
+    stats = ScoringStats()
+    prepared = prepare_features(feature_records, profile, stats)
+    if prepared is None:
+        return None
+
+    scores = prepared.scores(min_score=min_score)
+    return (
+        prepared.skills,
+        prepared.experience,
+        prepared.education,
+        scores.keywords,
+        prepared.failed,
+        stats
+    )
+
+def score_resumes_parallel(resumes, job, min_score=None, stats=None, max_workers=None, chunk_size=None):
+    """Score a block of resumes across a process pool.
+
+    Only the resume feature records and the compiled job profile are sent to
+    the workers. The merged result is identical to score_resume_batch with
+    the same min_score, and the workers' stage timings are added to stats.
+    When the pool is broken (a worker was killed), it is replaced for the
+    next run and this block is scored serially.
+    """
+    resumes = list(resumes)
+    profile = get_job_profile(job)
+    max_workers = max_workers or Config.get_ranking_config()['workers'] or os.cpu_count() or 1
+    if max_workers < 2 or len(resumes) < 2:
+        return score_resume_batch(resumes, profile, min_score=min_score, stats=stats)
+
+    chunk_size = chunk_size or -(-len(resumes) // (max_workers * 4))
+    feature_records = get_feature_records(resumes)
+
+    try:
+        executor = _get_executor(max_workers)
+        futures = [
+            executor.submit(_score_feature_chunk, profile, feature_records[start:start + chunk_size], min_score)
+            for start in range(0, len(feature_records), chunk_size)
+        ]
+        parts = [future.result() for future in futures]
+    except BrokenProcessPool:
+        _reset_executor()
+        return score_resume_batch(resumes, profile, min_score=min_score, stats=stats)
+
+    if any(part is None for part in parts):
+        # Job data cannot be scored in batch at all
+        return score_resume_batch(resumes, profile, min_score=min_score, stats=stats)
+
+    # Merge the partial results in chunk order
+    failed = []
+    for chunk_number, part in enumerate(parts):
+        failed.extend(chunk_number * chunk_size + index for index in part[4])
+        if stats is not None:
+            stats.merge(part[5])
+
+    skills, experience, education, keywords = (np.concatenate(arrays) for arrays in zip(*(part[:4] for part in parts)))
+    load_feature_sources([resumes[index] for index in failed])
+    fallback = {index: calculate_ranking(resumes[index], profile) for index in failed}
+    return BatchScores(skills, experience, education, keywords, fallback=fallback)
@@ -1,5 +1,31 @@
 import math
 from datetime import datetime
+from .tokenizer import STOPWORDS, keyword_set
+from .corpus_stats import get_idf_table
+
+# Stored with each ranking; bump when scoring results change
+ALGORITHM_VERSION = '1.2'
+
+# Component weights used by calculate_ranking
+RANKING_WEIGHTS = {
+    'skills': 0.4,      # 40% weight on skills
+    'experience': 0.3,   # 30% weight on experience
+    'education': 0.2,    # 20% weight on education
+    'keywords': 0.1      # 10% weight on keyword density
+}
+
+# Education hierarchy
+EDUCATION_LEVELS = {
+    'high school': 1,
+    'associate': 2,
+    'bachelor': 3,
+    'master': 4,
+    'phd': 5,
+    'doctorate': 5
+}
+
+# Common words ignored by keyword matching
+COMMON_WORDS = STOPWORDS
 
 def calculate_skill_match_score(resume_skills, job_skills):
     """Calculate skill match score between resume and job requirements."""
@@ -36,6 +62,16 @@ def calculate_experience_score(resume_experience, job_experience_required):
         ratio = resume_experience / job_experience_required
         return max(ratio, 0.1)  # Minimum 10% score
 
+def extract_education_level(education_entries):
+    """Get the highest education level mentioned in a list of education entries."""
+    highest_level = 0
+    for education in education_entries:
+        education_lower = education.lower()
+        for level, value in EDUCATION_LEVELS.items():
+            if level in education_lower:
+                highest_level = max(highest_level, value)
+    return highest_level
+
 def calculate_education_score(resume_education, job_education_required):
     """Calculate education score based on education requirements."""
     if not resume_education:
@@ -44,30 +80,9 @@ def calculate_education_score(resume_education, job_education_required):
     if not job_education_required:
         return 0.7  # Default score when no education requirement
     
-    # Education hierarchy
-    education_levels = {
-        'high school': 1,
-        'associate': 2,
-        'bachelor': 3,
-        'master': 4,
-        'phd': 5,
-        'doctorate': 5
-    }
-    
-    # Extract education level from resume
-    resume_level = 0
-    for education in resume_education:
-        education_lower = education.lower()
-        for level, value in education_levels.items():
-            if level in education_lower:
-                resume_level = max(resume_level, value)
-    
-    # Extract required education level
-    required_level = 0
-    job_education_lower = job_education_required.lower()
-    for level, value in education_levels.items():
-        if level in job_education_lower:
-            required_level = max(required_level, value)
+    # Extract education levels from resume and job requirement
+    resume_level = extract_education_level(resume_education)
+    required_level = extract_education_level([job_education_required])
     
     if resume_level >= required_level:
         return 1.0
@@ -76,30 +91,45 @@ def calculate_education_score(resume_education, job_education_required):
     else:
         return 0.3
 
-def calculate_keyword_density_score(resume_text, job_description):
-    """Calculate keyword density score."""
+def calculate_keyword_density_score(resume_text, job_description, term_weights=None):
+    """Calculate keyword density score.
+    
+    With term_weights (job keyword -> IDF weight), matched keywords count by
+    weight instead of each counting once.
+    """
     if not resume_text or not job_description:
         return 0.0
     
-    # Extract keywords from job description (simple approach)
-    job_words = set(job_description.lower().split())
-    resume_words = set(resume_text.lower().split())
-    
-    # Remove common words
-    common_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'must', 'shall', 'a', 'an', 'this', 'that', 'these', 'those'}
-    
-    job_keywords = job_words - common_words
-    resume_keywords = resume_words - common_words
+    # Extract keywords with the shared tokenizer (common words removed)
+    job_keywords = keyword_set(job_description)
+    resume_keywords = keyword_set(resume_text)
     
     if not job_keywords:
         return 0.0
     
     # Calculate keyword match
     matched_keywords = job_keywords & resume_keywords
-    keyword_score = len(matched_keywords) / len(job_keywords)
+    if term_weights is not None:
+        matched_weight = sum(term_weights[keyword] for keyword in matched_keywords)
+        keyword_score = matched_weight / sum(term_weights[keyword] for keyword in job_keywords)
+    else:
+        keyword_score = len(matched_keywords) / len(job_keywords)
     
     return min(keyword_score, 1.0)
 
+def get_keyword_weights(job):
+    """Get IDF weights for a job's keywords, or None when IDF scoring is disabled."""
+    keyword_weights = getattr(job, 'keyword_weights', None)
+    if keyword_weights is None:
+        idf_table = get_idf_table()
+        if idf_table is not None:
+            keyword_weights = idf_table.term_weights(keyword_set(job.description or ""))
+    return keyword_weights
+
+def _job_keyword_density_score(resume_text, job):
+    """Calculate keyword density score against a job, IDF-weighted when enabled."""
+    return calculate_keyword_density_score(resume_text, job.description or "", get_keyword_weights(job))
+
 def calculate_overall_score(scores, weights):
     """Calculate weighted overall score."""
     if not scores or not weights:
@@ -127,8 +157,62 @@ def calculate_confidence_score(scores):
     confidence = available_scores / total_scores
     return confidence
 
+def calculate_score_upper_bound(known_scores=None, weights=None):
+    """Calculate the best overall score reachable given some known component scores.
+    
+    Components missing from known_scores are assumed to score a perfect 1.0.
+    """
+    weights = weights or RANKING_WEIGHTS
+    known_scores = known_scores or {}
+    
+    scores = {component: known_scores.get(component, 1.0) for component in weights}
+    overall_score = calculate_overall_score(scores, weights)
+    confidence_score = calculate_confidence_score(scores)
+    
+    return min(max(overall_score * confidence_score, 0.0), 1.0)
+
+class ScoringStats:
+    """Per-stage run counts, skip counts and timings collected while scoring."""
+    
+    def __init__(self):
+        self.stages = {}
+    
+    def _stage(self, stage):
+        return self.stages.setdefault(stage, {'runs': 0, 'skipped': 0, 'seconds': 0.0})
+    
+    def record(self, stage, seconds, runs=1):
+        """Record time spent running a stage for one or more candidates."""
+        stage_stats = self._stage(stage)
+        stage_stats['runs'] += runs
+        stage_stats['seconds'] += seconds
+    
+    def skip(self, stage, count=1):
+        """Record candidates for which a stage was skipped."""
+        self._stage(stage)['skipped'] += count
+    
+    def merge(self, other):
+        """Add the counts and timings of another ScoringStats."""
+        for stage, stage_stats in other.stages.items():
+            merged = self._stage(stage)
+            for key, value in stage_stats.items():
+                merged[key] += value
+    
+    def to_dict(self):
+        """Convert stats to dictionary."""
+        return {
+            stage: {
+                'runs': stage_stats['runs'],
+                'skipped': stage_stats['skipped'],
+                'seconds': round(stage_stats['seconds'], 6)
+            }
+            for stage, stage_stats in self.stages.items()
+        }
+
 def calculate_ranking(resume, job):
-    """Calculate ranking for a resume-job pair."""
+    """Calculate ranking for a resume-job pair.
+    
+    job may be a Job or its compiled JobProfile.
+    """
     try:
         # Extract data from resume
         resume_data = resume.parsed_data or {}
@@ -142,23 +226,20 @@ def calculate_ranking(resume, job):
         job_skills = job_requirements.get('skills', [])
         job_experience_required = job_requirements.get('experience_years', 0)
         job_education_required = job_requirements.get('education', "")
-        job_description = job.description or ""
         
         # Calculate component scores
-        scores = {
+        component_scores = {
             'skills': calculate_skill_match_score(resume_skills, job_skills),
             'experience': calculate_experience_score(resume_experience, job_experience_required),
             'education': calculate_education_score(resume_education, job_education_required),
-            'keywords': calculate_keyword_density_score(resume_text, job_description)
+            'keywords': _job_keyword_density_score(resume_text, job)
         }
         
-        # Define weights for different components
-        weights = {
-            'skills': 0.4,      # 40% weight on skills
-            'experience': 0.3,   # 30% weight on experience
-            'education': 0.2,    # 20% weight on education
-            'keywords': 0.1      # 10% weight on keyword density
-        }
+        # Weights for different components
+        weights = dict(RANKING_WEIGHTS)
+        
+        # Components in weight order, so the overall score sums the same way
+        scores = {component: component_scores[component] for component in weights}
         
         # Calculate overall score
         overall_score = calculate_overall_score(scores, weights)
@@ -192,29 +273,37 @@ def calculate_ranking(resume, job):
             'calculation_timestamp': datetime.utcnow().isoformat()
         }
 
-def rank_resumes_for_job(resumes, job):
-    """Rank multiple resumes for a single job."""
-    rankings = []
+def rank_resumes_for_job(resumes, job, top_k=None):
+    """Rank multiple resumes for a single job.
     
-    for resume in resumes:
-        ranking_data = calculate_ranking(resume, job)
-        rankings.append({
-            'resume_id': resume.id,
-            'resume': resume,
-            'ranking_data': ranking_data
-        })
+    Returns a RankingResults sequence of {'resume_id', 'resume',
+    'ranking_data'} dicts, best first. When top_k is given, only the best
+    top_k resumes are returned.
+    """
+    from .batch_scoring import score_resume_batch, score_top_k
+    from .job_profile import get_job_profile
+    from .ranking_results import RankingResults
     
-    # Sort by overall score (descending)
-    rankings.sort(key=lambda x: x['ranking_data']['overall_score'], reverse=True)
+    resumes = list(resumes)
+    job = get_job_profile(job)
     
-    return rankings
+    if top_k is not None:
+        # Bounded heap with early termination on score upper bounds
+        return RankingResults.from_scored(resumes, score_top_k(resumes, job, top_k))
+    
+    # Score the whole pool in one vectorized pass, sorted by overall score (descending)
+    return RankingResults.ranked(resumes, score_resume_batch(resumes, job))
 
 def get_ranking_insights(rankings):
     """Generate insights from ranking results."""
     if not rankings:
         return {}
     
-    scores = [r['ranking_data']['overall_score'] for r in rankings]
+    if hasattr(rankings, 'overall_scores'):
+        # RankingResults: read the score array instead of building every row
+        scores = rankings.overall_scores.tolist()
+    else:
+        scores = [r['ranking_data']['overall_score'] for r in rankings]
     
     insights = {
         'total_candidates': len(rankings),
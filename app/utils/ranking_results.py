@@ -0,0 +1,110 @@
+import numpy as np
+from datetime import datetime
+from ..models.ranking import Ranking
+from .ranking_algorithm import ALGORITHM_VERSION
+from .batch_scoring import BatchScores
+
+class RankingResults:
+    """Ranked resumes for one job, stored as score arrays.
+
+    Position i holds resumes[i], scored by row rows[i] of a BatchScores, so
+    duplicates can share a row. Acts as a read-only sequence of
+    {'resume_id', 'resume', 'ranking_data'} dicts and only builds a dict,
+    or a Ranking model, for the positions that are actually accessed.
+    """
+
+    __slots__ = ('resumes', 'scores', 'rows', 'timestamp')
+
+    def __init__(self, resumes, scores, rows=None, timestamp=None):
+        self.resumes = resumes
+        self.scores = scores
+        self.rows = np.arange(len(resumes)) if rows is None else np.asarray(rows, dtype=np.int64)
+        self.timestamp = timestamp or datetime.utcnow().isoformat()
+
+    @classmethod
+    def ranked(cls, resumes, scores):
+        """Order scored resumes by overall score, keeping input order for ties."""
+        order = np.argsort(-scores.overall, kind='stable')
+        return cls([resumes[index] for index in order.tolist()], scores, order)
+
+    @classmethod
+    def from_scored(cls, resumes, scored):
+        """Build results from already ranked (index, ranking_data) pairs."""
+        return cls(
+            [resumes[index] for index, _ in scored],
+            BatchScores.from_ranking_data([ranking_data for _, ranking_data in scored])
+        )
+
+    def _select(self, positions):
+        """Get the results at the given positions."""
+        return RankingResults(
+            [self.resumes[position] for position in positions],
+            self.scores, self.rows[positions], self.timestamp
+        )
+
+    def with_duplicates(self, duplicates):
+        """Add the duplicates of each resume right after it, sharing its scores.
+
+        duplicates maps a canonical resume _id to its duplicate resumes.
+        """
+        if not duplicates:
+            return self
+
+        resumes = []
+        rows = []
+        for resume, row in zip(self.resumes, self.rows.tolist()):
+            resumes.append(resume)
+            rows.append(row)
+            for duplicate in duplicates.get(resume._id, []):
+                resumes.append(duplicate)
+                rows.append(row)
+        return RankingResults(resumes, self.scores, rows, self.timestamp)
+
+    def limit(self, count):
+        """Get the first count results."""
+        return self._select(np.arange(min(count, len(self))))
+
+    def above(self, min_score):
+        """Get the results scoring at least min_score."""
+        return self._select(np.flatnonzero(self.overall_scores >= min_score))
+
+    @property
+    def overall_scores(self):
+        """Overall scores in result order."""
+        return self.scores.overall[self.rows]
+
+    def ranking_data(self, position):
+        """Get the calculate_ranking style result at a position."""
+        return self.scores.ranking_data(int(self.rows[position]), self.timestamp)
+
+    def to_ranking(self, position, job_id):
+        """Build the Ranking model for a position."""
+        ranking_data = self.ranking_data(position)
+        return Ranking(
+            resume_id=self.resumes[position]._id,
+            job_id=job_id,
+            overall_score=ranking_data['overall_score'],
+            score_breakdown=ranking_data['score_breakdown'],
+            confidence_score=ranking_data['confidence_score'],
+            algorithm_version=ALGORITHM_VERSION
+        )
+
+    def __len__(self):
+        return len(self.resumes)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(len(self)))]
+        resume = self.resumes[position]
+        return {
+            'resume_id': resume.id,
+            'resume': resume,
+            'ranking_data': self.ranking_data(position)
+        }
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def __repr__(self):
+        return f'<RankingResults {len(self)} resumes>'
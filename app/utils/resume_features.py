@@ -0,0 +1,71 @@
+from .ranking_algorithm import extract_education_level
+from .tokenizer import keyword_set
+
+# Bump whenever the feature record layout or derivation changes
+FEATURE_VERSION = 3
+
+# Resume fields the feature record is built from
+FEATURE_SOURCE_FIELDS = ('parsed_data', 'raw_text')
+
+def build_resume_features(parsed_data, raw_text):
+    """Build the resume-side ranking features from parsed data and raw text.
+
+    The record holds everything the scorers need from a resume, so ranking
+    does not have to re-tokenize raw_text for every job.
+    """
+    parsed_data = parsed_data or {}
+    skills = parsed_data.get('skills', [])
+    education = parsed_data.get('education', [])
+    raw_text = raw_text or ""
+
+    return {
+        'version': FEATURE_VERSION,
+        'skills': sorted(set(skill.lower() for skill in skills)) if skills else [],
+        'experience_years': parsed_data.get('experience_years', 0),
+        'education_level': extract_education_level(education) if education else 0,
+        'has_education': bool(education),
+        'keywords': sorted(keyword_set(raw_text)) if raw_text else []
+    }
+
+def is_current(features):
+    """Check whether a feature record is present and up to date."""
+    return bool(features) and features.get('version') == FEATURE_VERSION
+
+def load_feature_sources(resumes):
+    """Load the feature source fields of partially loaded resumes in one query.
+
+    Stale feature records are rebuilt from them, and calculate_ranking reads
+    them directly.
+    """
+    from ..models.resume import Resume
+
+    partial = [resume for resume in resumes if getattr(resume, 'projection', None)]
+    if partial:
+        Resume.load_fields(partial, FEATURE_SOURCE_FIELDS)
+
+def get_resume_features(resume):
+    """Get the feature record for a resume, rebuilding it if missing or outdated.
+
+    Returns None when the resume data cannot be turned into features.
+    """
+    features = resume.features
+    if is_current(features):
+        return features
+
+    try:
+        features = build_resume_features(resume.parsed_data, resume.raw_text)
+    except Exception:
+        return None
+
+    # Keep the rebuilt record on the instance for subsequent jobs
+    resume.features = features
+    return features
+
+def get_feature_records(resumes):
+    """Get the feature records of many resumes.
+
+    Resumes loaded without their feature source fields get them in a single
+    query when their records need rebuilding.
+    """
+    load_feature_sources([resume for resume in resumes if not is_current(resume.features)])
+    return [get_resume_features(resume) for resume in resumes]
@@ -5,6 +5,7 @@ import pdfplumber
 from datetime import datetime
 from PyPDF2 import PdfReader
 from docx import Document
+from .resume_features import build_resume_features
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -150,6 +151,7 @@ def parse_resume(file_path):
             'name': structured_data['name'],
             'email': structured_data['email'],
             'phone': structured_data['phone'],
+            'features': build_resume_features(structured_data, raw_text),
             'parsing_timestamp': datetime.utcnow().isoformat()
         }
         
@@ -0,0 +1,61 @@
+"""
+Cold-start profiling.
+create_app times each startup phase, and the first request served, and
+reports them against Config.COLD_START_BUDGET_MS. The profile is printed at
+startup and returned by the /health endpoint.
+"""
+
+import time
+from contextlib import contextmanager
+
+class StartupProfile:
+    """Durations of the startup phases of one app, in milliseconds."""
+
+    __slots__ = ('started_at', 'phases', 'first_request_ms')
+
+    def __init__(self, started_at=None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.phases = []
+        self.first_request_ms = None
+
+    def add(self, name, ms):
+        """Record a phase that took ms milliseconds."""
+        self.phases.append((name, ms))
+
+    @contextmanager
+    def phase(self, name):
+        """Time the phase run inside the with block."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started_at) * 1000)
+
+    def request_served(self):
+        """Record the time to the end of the first request, once."""
+        if self.first_request_ms is None:
+            self.first_request_ms = (time.perf_counter() - self.started_at) * 1000
+
+    @property
+    def total_ms(self):
+        """Time spent in the startup phases."""
+        return sum(ms for _, ms in self.phases)
+
+    def to_dict(self, budget_ms):
+        """Get the profile as a JSON-serializable dict."""
+        return {
+            'total_ms': round(self.total_ms, 1),
+            'budget_ms': budget_ms,
+            'within_budget': self.total_ms <= budget_ms,
+            'phases': {name: round(ms, 1) for name, ms in self.phases},
+            'first_request_ms': round(self.first_request_ms, 1) if self.first_request_ms is not None else None
+        }
+
+    def summary(self, budget_ms):
+        """Get a one-line report of the profile."""
+        phases = ', '.join(f"{name} {ms:.0f} ms" for name, ms in self.phases)
+        status = 'within' if self.total_ms <= budget_ms else 'OVER'
+        return f"Startup took {self.total_ms:.0f} ms ({phases}), {status} the {budget_ms} ms budget"
+
+    def __repr__(self):
+        return f'<StartupProfile {self.total_ms:.0f} ms>'
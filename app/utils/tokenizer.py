@@ -0,0 +1,83 @@
+import re
+import unicodedata
+import threading
+import numpy as np
+
+# Common words ignored by keyword matching
+STOPWORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'must',
+    'shall', 'a', 'an', 'this', 'that', 'these', 'those'
+})
+
+# Words are runs of letters/digits in any script, keeping inner separators
+# and tech suffixes such as "node.js", "ci/cd", "e-commerce", "c++" and "c#".
+# Underscores separate words; tokenize() replaces them before matching,
+# which is cheaper than excluding them from the \w class
+TOKEN_PATTERN = re.compile(r"[\w+#]+(?:[./\-][\w+#]+)*")
+
+def tokenize(text):
+    """Split text into lowercase tokens with surrounding punctuation removed.
+
+    Text is NFC-normalized first, so accented letters written with
+    combining marks stay inside their word.
+    """
+    text = unicodedata.normalize('NFC', text).lower().replace('_', ' ')
+    return TOKEN_PATTERN.findall(text)
+
+def keyword_set(text):
+    """Get the set of non-stopword tokens in a text."""
+    return set(tokenize(text)) - STOPWORDS
+
+class Vocabulary:
+    """Process-wide mapping from tokens to integer ids.
+
+    Ids are only meaningful inside the process that assigned them and must
+    not be persisted; store tokens instead.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def token_id(self, token):
+        """Get the id for a token, assigning a new one if needed."""
+        token_id = self._ids.get(token)
+        if token_id is None:
+            with self._lock:
+                token_id = self._ids.setdefault(token, len(self._ids))
+        return token_id
+
+    def encode(self, tokens):
+        """Encode tokens as a sorted array of unique ids."""
+        ids = np.fromiter((self.token_id(token) for token in tokens), dtype=np.int64)
+        return np.unique(ids)
+
+    def encode_many(self, token_lists, add_missing=True):
+        """Encode several token lists into one flat id array plus row offsets.
+
+        Row i owns ids[offsets[i]:offsets[i + 1]]. Rows are not deduplicated,
+        so this is the CSR layout of a document x token matrix. With
+        add_missing=False, tokens not in the vocabulary are left out.
+        """
+        if add_missing:
+            rows = [[self.token_id(token) for token in tokens] for tokens in token_lists]
+        else:
+            known = self._ids
+            rows = [[known[token] for token in tokens if token in known] for tokens in token_lists]
+
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=offsets[1:])
+        ids = np.fromiter(
+            (token_id for row in rows for token_id in row),
+            dtype=np.int64,
+            count=int(offsets[-1])
+        )
+        return ids, offsets
+
+# Shared vocabulary for this process
+vocabulary = Vocabulary()
@@ -0,0 +1,10 @@
+from app import create_app
+
+# Async entry point: the rankings, analytics and LLM endpoints do their
+# database (Motor) and LLM I/O on one event loop per worker process, so run
+# it with threads that wait on that loop, e.g.
+#   gunicorn --worker-class gthread --threads 32 async_app:app
+app = create_app(async_io=True)
+
+if __name__ == "__main__":
+    app.run(debug=True, host='0.0.0.0', port=5001, threaded=True)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Ranking Benchmark Script for HR Resume System
+Scores synthetic candidate pools with each ranking path and saves the
+results as JSON, so throughput and latency can be compared between commits.
+
+Usage:
+    python -m benchmarks.ranking_benchmark
+    python -m benchmarks.ranking_benchmark --sizes 1000,10000 --jobs 5 --modes batch,top_k
+"""
+
+import os
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from app.utils.ranking_algorithm import calculate_ranking
+from app.utils.batch_scoring import score_resume_batch, score_top_k
+from benchmarks.synthetic import generate_resumes, generate_jobs
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+RESULTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def run_per_pair(resumes, job, latencies):
+    """Score every pair with calculate_ranking, timing each call."""
+    for resume in resumes:
+        start = time.perf_counter()
+        calculate_ranking(resume, job)
+        latencies.append(time.perf_counter() - start)
+
+def run_batch(resumes, job, latencies):
+    """Score the pool with the vectorized batch scorer, recording its amortized per-pair time."""
+    start = time.perf_counter()
+    score_resume_batch(resumes, job)
+    latencies.append((time.perf_counter() - start) / len(resumes))
+
+def run_top_k(resumes, job, latencies, k=50):
+    """Find the top k resumes with upper-bound early termination, recording its amortized per-pair time."""
+    start = time.perf_counter()
+    score_top_k(resumes, job, k)
+    latencies.append((time.perf_counter() - start) / len(resumes))
+
+MODES = {
+    'per_pair': run_per_pair,
+    'batch': run_batch,
+    'top_k': run_top_k
+}
+
+# Modes timing every pair on its own; the others score a whole pool per call
+PER_PAIR_MODES = {'per_pair'}
+
+def measure(mode, resumes, jobs):
+    """Measure throughput, per-pair latency and peak memory for one mode.
+
+    The per-pair mode reports p50/p99 latency over every pair. Batch modes
+    only time whole pools, so they report the mean amortized per-pair
+    latency over the jobs instead, without percentiles. Peak
+    memory is taken from a separate traced run of the first job, so tracing
+    does not slow down the timed runs.
+    """
+    run = MODES[mode]
+
+    latencies = []
+    start = time.perf_counter()
+    for job in jobs:
+        run(resumes, job, latencies)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run(resumes, jobs[0], [])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pairs = len(resumes) * len(jobs)
+    latencies_ms = np.array(latencies) * 1000
+    result = {
+        'mode': mode,
+        'candidates': len(resumes),
+        'jobs': len(jobs),
+        'pairs': pairs,
+        'seconds': round(elapsed, 4),
+        'pairs_per_second': round(pairs / elapsed, 1) if elapsed else None,
+        'p50_ms': None,
+        'p99_ms': None,
+        'amortized_ms': None,
+        'peak_memory_mb': round(peak / (1024 * 1024), 2)
+    }
+    if mode in PER_PAIR_MODES:
+        result['p50_ms'] = round(float(np.percentile(latencies_ms, 50)), 6)
+        result['p99_ms'] = round(float(np.percentile(latencies_ms, 99)), 6)
+    else:
+        result['amortized_ms'] = round(float(latencies_ms.mean()), 6)
+    return result
+
+def format_latency(result):
+    """Format the latency figures of a result for the console."""
+    if result['amortized_ms'] is not None:
+        return f"amortized {result['amortized_ms']:.4f} ms/pair"
+    return f"p50 {result['p50_ms']:.4f} ms  p99 {result['p99_ms']:.4f} ms"
+
+def get_commit():
+    """Get the current git commit, if available."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Benchmark the resume ranking engine.')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='comma separated candidate pool sizes')
+    parser.add_argument('--jobs', type=int, default=3, help='jobs scored per pool')
+    parser.add_argument('--modes', default=','.join(MODES), help='comma separated ranking paths')
+    parser.add_argument('--text-words', type=int, default=300, help='raw text length of each resume')
+    parser.add_argument('--seed', type=int, default=42, help='corpus generator seed')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<timestamp>_<commit>.json)')
+    return parser.parse_args()
+
+def main():
+    """Run the ranking benchmarks."""
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+    modes = args.modes.split(',')
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        print(f"❌ Unknown modes: {', '.join(unknown)}")
+        exit(1)
+
+    commit = get_commit()
+    report = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'parameters': {
+            'sizes': sizes,
+            'jobs': args.jobs,
+            'modes': modes,
+            'text_words': args.text_words,
+            'seed': args.seed
+        },
+        'results': []
+    }
+
+    jobs = generate_jobs(args.jobs, seed=args.seed + 1)
+    for size in sizes:
+        print(f"Generating {size} synthetic resumes...")
+        resumes = generate_resumes(size, seed=args.seed, text_words=args.text_words)
+
+        for mode in modes:
+            result = measure(mode, resumes, jobs)
+            report['results'].append(result)
+            print(f"- {mode:<8} {size:>7} candidates: {result['pairs_per_second']:>12,.0f} pairs/s  "
+                  f"{format_latency(result)}  "
+                  f"peak {result['peak_memory_mb']:.1f} MB")
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_FOLDER, exist_ok=True)
+        filename = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}_{commit or 'unknown'}.json"
+        output = os.path.join(RESULTS_FOLDER, filename)
+
+    with open(output, 'w') as results_file:
+        json.dump(report, results_file, indent=2)
+
+    print(f"\n✅ Results saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic resume and job corpora for ranking benchmarks.
+Generated data is fully determined by the seed, so runs are comparable.
+"""
+
+import random
+from app.models.resume import Resume
+from app.models.job import Job
+from app.utils.resume_features import build_resume_features
+
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C++', 'C#', 'Ruby', 'PHP',
+    'SQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Kafka', 'Spark', 'Hadoop', 'Airflow',
+    'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'Spring', 'FastAPI',
+    'Docker', 'Kubernetes', 'Terraform', 'AWS', 'Azure', 'GCP', 'Linux', 'Git', 'CI/CD',
+    'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Pandas', 'NumPy',
+    'Data Analysis', 'Tableau', 'Excel', 'Project Management', 'Agile', 'Scrum',
+    'Communication', 'Leadership', 'REST', 'GraphQL', 'Microservices', 'Security'
+]
+
+EDUCATION = [
+    'High School Diploma',
+    'Associate Degree in Information Technology',
+    'Bachelor of Science in Computer Science',
+    'Bachelor of Engineering',
+    'Master of Science in Data Science',
+    'Master of Business Administration',
+    'PhD in Computer Science'
+]
+
+JOB_EDUCATION = ['', 'High School', 'Associate degree', 'Bachelor degree', 'Master degree', 'PhD']
+
+JOB_TITLES = [
+    'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Data Scientist',
+    'Data Engineer', 'DevOps Engineer', 'Machine Learning Engineer', 'Product Manager'
+]
+
+# General vocabulary mixed into raw text around skill mentions
+WORDS = (
+    'the and with for of to in on a team project built designed developed led managed '
+    'improved delivered scalable reliable services platform system customers data pipeline '
+    'performance production deployed migrated architecture cloud infrastructure testing '
+    'automation monitoring analytics reporting stakeholders requirements features release '
+    'users api backend frontend mobile web application database integration quality '
+    'reduced increased latency cost revenue growth experience responsible collaborated '
+    'mentored engineers across company startup enterprise global remote agile sprint'
+).split()
+
+def generate_text(rng, word_count, skills=()):
+    """Generate raw text of about word_count words mentioning the given skills."""
+    words = [rng.choice(WORDS) for _ in range(word_count)]
+    for skill in skills:
+        words[rng.randrange(len(words))] = skill
+    return ' '.join(words)
+
+def generate_resumes(count, seed=42, text_words=300):
+    """Generate completed resumes with skills, experience, education and raw text.
+
+    Feature records are filled in the same way upload does.
+    """
+    rng = random.Random(seed)
+    resumes = []
+    for index in range(count):
+        skills = rng.sample(SKILLS, rng.randint(2, 12))
+        education = rng.sample(EDUCATION, rng.choice([0, 1, 1, 1, 2]))
+        parsed_data = {
+            'skills': skills,
+            'experience_years': rng.choice([0, 0.5] + list(range(1, 21))),
+            'education': education
+        }
+        raw_text = generate_text(rng, max(text_words, len(skills)), skills)
+        resumes.append(Resume(
+            filename=f'synthetic_{index}.pdf',
+            raw_text=raw_text,
+            parsed_data=parsed_data,
+            features=build_resume_features(parsed_data, raw_text),
+            processing_status='completed'
+        ))
+    return resumes
+
+def generate_jobs(count, seed=7, description_words=120):
+    """Generate active jobs with skill, experience and education requirements."""
+    rng = random.Random(seed)
+    jobs = []
+    for index in range(count):
+        skills = rng.sample(SKILLS, rng.randint(3, 8))
+        jobs.append(Job(
+            title=f'{rng.choice(JOB_TITLES)} {index}',
+            description=generate_text(rng, max(description_words, len(skills)), skills),
+            requirements={
+                'skills': skills,
+                'experience_years': rng.choice([0, 1, 2, 3, 5, 7, 10]),
+                'education': rng.choice(JOB_EDUCATION)
+            },
+            status='active'
+        ))
+    return jobs
@@ -32,6 +32,22 @@ class Config:
     GROQ_API_KEY = os.getenv('GROQ_API_KEY')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL')
     
+    # Ranking Configuration
+    RANKING_WORKERS = int(os.getenv('RANKING_WORKERS', '0'))  # 0 uses all CPU cores
+    PARALLEL_RANKING_THRESHOLD = int(os.getenv('PARALLEL_RANKING_THRESHOLD', '500'))
+    JOB_PROFILE_CACHE_SIZE = int(os.getenv('JOB_PROFILE_CACHE_SIZE', '256'))
+    RANKING_WRITE_BATCH_SIZE = int(os.getenv('RANKING_WRITE_BATCH_SIZE', '1000'))
+    IDF_KEYWORD_SCORING = os.getenv('IDF_KEYWORD_SCORING', 'False').lower() == 'true'
+    IDF_CACHE_TTL = int(os.getenv('IDF_CACHE_TTL', '300'))  # seconds
+    
+    # Pagination Configuration
+    COUNT_CACHE_TTL = int(os.getenv('COUNT_CACHE_TTL', '30'))  # seconds
+    COUNT_CACHE_SIZE = int(os.getenv('COUNT_CACHE_SIZE', '1024'))
+    
+    # Startup Configuration
+    LAZY_DB_INIT = os.getenv('LAZY_DB_INIT', 'False').lower() == 'true'
+    COLD_START_BUDGET_MS = int(os.getenv('COLD_START_BUDGET_MS', '1500'))
+    
     # Application Settings
     FLASK_ENV = os.getenv('FLASK_ENV')
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
@@ -72,6 +88,34 @@ class Config:
             'openai_model': cls.OPENAI_MODEL
         }
     
+    @classmethod
+    def get_ranking_config(cls):
+        """Get ranking engine configuration."""
+        return {
+            'workers': cls.RANKING_WORKERS,
+            'parallel_threshold': cls.PARALLEL_RANKING_THRESHOLD,
+            'job_profile_cache_size': cls.JOB_PROFILE_CACHE_SIZE,
+            'write_batch_size': cls.RANKING_WRITE_BATCH_SIZE,
+            'idf_keyword_scoring': cls.IDF_KEYWORD_SCORING,
+            'idf_cache_ttl': cls.IDF_CACHE_TTL
+        }
+    
+    @classmethod
+    def get_pagination_config(cls):
+        """Get list pagination configuration."""
+        return {
+            'count_cache_ttl': cls.COUNT_CACHE_TTL,
+            'count_cache_size': cls.COUNT_CACHE_SIZE
+        }
+    
+    @classmethod
+    def get_startup_config(cls):
+        """Get startup configuration."""
+        return {
+            'lazy_db_init': cls.LAZY_DB_INIT,
+            'cold_start_budget_ms': cls.COLD_START_BUDGET_MS
+        }
+    
     @classmethod
     def is_production(cls):
         """Check if running in production mode."""
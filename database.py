@@ -3,11 +3,8 @@
 MongoDB Database Configuration and Connection
 """
 
-import os
+import threading
 from pymongo import MongoClient
-from bson import ObjectId
-import hashlib
-from datetime import datetime
 from dotenv import load_dotenv
 from config import Config
 
@@ -21,11 +18,19 @@ class MongoDB:
         self.connection_string = Config.get_mongodb_uri()
         self.client = None
         self.db = None
+        self.lock = threading.Lock()
+        # Motor client, created on first use (see get_async_database)
+        self.async_client = None
+        self.async_db = None
        
-    def connect(self):
-        """Connect to MongoDB."""
+    def connect(self, lazy=False):
+        """Connect to MongoDB.
+        
+        With lazy, nothing is sent to the server: the client opens its
+        connections when the database is first used.
+        """
         try:
-            self.client = MongoClient(self.connection_string)
+            self.client = MongoClient(self.connection_string, connect=not lazy)
             # Extract database name from connection string or use default
             if 'hr_system' in self.connection_string:
                 db_name = 'hr_system'
@@ -33,6 +38,9 @@ class MongoDB:
                 db_name = 'hr_system'
             self.db = self.client[db_name]
             
+            if lazy:
+                return True
+            
             # Test connection
             self.client.admin.command('ping')
             print(f"Connected to MongoDB successfully! Database: {db_name}")
@@ -47,111 +55,35 @@ class MongoDB:
         if self.client:
             self.client.close()
             print("MongoDB connection closed")
+        if self.async_client:
+            self.async_client.close()
+            self.async_client = None
+            self.async_db = None
     
     def get_database(self):
-        """Get database instance."""
+        """Get database instance, connecting lazily if not connected yet."""
+        if self.db is None:
+            with self.lock:
+                if self.db is None:
+                    self.connect(lazy=True)
         return self.db
     
     def get_collection(self, collection_name):
         """Get collection instance."""
-        return self.db[collection_name]
-    
-    def create_indexes(self):
-        """Create indexes for better performance."""
-        try:
-            # User collection indexes
-            self.db.users.create_index("email", unique=True)
-            self.db.users.create_index("is_active")
-            
-            # Resume collection indexes
-            self.db.resumes.create_index("processing_status")
-            self.db.resumes.create_index("candidate_email")
-            self.db.resumes.create_index("uploaded_at")
-            
-            # Job collection indexes
-            self.db.jobs.create_index("status")
-            self.db.jobs.create_index("created_at")
-            self.db.jobs.create_index("priority")
-            
-            # Ranking collection indexes
-            self.db.rankings.create_index("overall_score")
-            self.db.rankings.create_index([("resume_id", 1), ("job_id", 1)], unique=True)
-            self.db.rankings.create_index("created_at")
-            
-            print("Indexes created successfully!")
-            
-        except Exception as e:
-            print(f"Error creating indexes: {str(e)}")
+        return self.get_database()[collection_name]
     
-    def setup_default_data(self):
-        """Set up default admin user and sample data."""
-        try:
-            # Create default admin user if not exists
-            admin_user = self.db.users.find_one({"email": "admin@example.com"})
-            if not admin_user:
-                from werkzeug.security import generate_password_hash
-                password_hash = generate_password_hash("admin123")
-                admin_data = {
-                    "email": "admin@example.com",
-                    "password_hash": password_hash,
-                    "role": "admin",
-                    "is_active": True,
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                }
-                self.db.users.insert_one(admin_data)
-                print("Default admin user created!")
-            
-            # Create sample jobs if none exist
-            job_count = self.db.jobs.count_documents({})
-            if job_count == 0:
-                sample_jobs = [
-                    {
-                        "title": "Software Engineer",
-                        "description": "We are looking for a skilled software engineer to join our team",
-                        "company": "Tech Corp",
-                        "location": "San Francisco, CA",
-                        "employment_type": "full-time",
-                        "requirements": {
-                            "skills": ["Python", "React", "JavaScript", "SQL"],
-                            "experience_years": 3,
-                            "education": "Bachelor degree"
-                        },
-                        "salary_min": 80000,
-                        "salary_max": 120000,
-                        "currency": "USD",
-                        "status": "active",
-                        "priority": 1,
-                        "created_at": datetime.utcnow(),
-                        "updated_at": datetime.utcnow()
-                    },
-                    {
-                        "title": "Data Scientist",
-                        "description": "Join our data science team to analyze complex datasets",
-                        "company": "Data Analytics Inc",
-                        "location": "New York, NY",
-                        "employment_type": "full-time",
-                        "requirements": {
-                            "skills": ["Python", "Machine Learning", "SQL", "Statistics"],
-                            "experience_years": 2,
-                            "education": "Master degree"
-                        },
-                        "salary_min": 90000,
-                        "salary_max": 140000,
-                        "currency": "USD",
-                        "status": "active",
-                        "priority": 2,
-                        "created_at": datetime.utcnow(),
-                        "updated_at": datetime.utcnow()
-                    }
-                ]
-                self.db.jobs.insert_many(sample_jobs)
-                print("Sample jobs created!")
-            
-            print("Default data setup complete!")
-            
-        except Exception as e:
-            print(f"Error setting up default data: {str(e)}")
+    def get_async_database(self):
+        """Get the Motor database instance, connecting on first use.
+        
+        Motor binds its client to the event loop it is first used on, so
+        this should only be called from the app's event loop (see
+        app.event_loop).
+        """
+        if self.async_db is None:
+            from motor.motor_asyncio import AsyncIOMotorClient
+            self.async_client = AsyncIOMotorClient(self.connection_string)
+            self.async_db = self.async_client['hr_system']
+        return self.async_db
 
 # Global MongoDB instance
 mongodb = MongoDB()
@@ -164,11 +96,37 @@ def get_collection(collection_name):
     """Get MongoDB collection instance."""
     return mongodb.get_collection(collection_name)
 
-def init_db():
-    """Initialize database connection and setup."""
+def get_async_db():
+    """Get Motor database instance."""
+    return mongodb.get_async_database()
+
+def get_async_collection(collection_name):
+    """Get Motor collection instance."""
+    return mongodb.get_async_database()[collection_name]
+
+def init_db(lazy=False):
+    """Initialize database connection and setup.
+    
+    Connects and applies any pending migrations (see
+    app.models.migrations). With lazy, startup sends nothing to the
+    server: the client connects on first use and migrations are left to
+    setup_mongodb.py.
+    """
+    if lazy:
+        return mongodb.connect(lazy=True)
+    
     if mongodb.connect():
-        mongodb.create_indexes()
-        mongodb.setup_default_data()
+        from app.models.migrations import apply_migrations, pending_migrations
+        
+        try:
+            for version, name in apply_migrations(mongodb.db):
+                print(f"Applied migration {version}: {name}")
+            pending = pending_migrations(mongodb.db)
+            if pending:
+                version, name, _ = pending[0]
+                print(f"Migration {version} ({name}) is being applied by another process, later ones wait for it")
+        except Exception as e:
+            print(f"Error applying migrations: {str(e)}")
         return True
     return False
 
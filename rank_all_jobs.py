@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Bulk Ranking Script for HR Resume System
+This script ranks every completed resume against every active job in one pass.
+"""
+
+from database import init_db
+from app.utils.bulk_ranking import rank_all_jobs
+
+def main():
+    """Rank all resumes for all active jobs."""
+    print("Ranking all resumes against all active jobs...")
+    
+    if not init_db():
+        print("\n❌ Database connection failed!")
+        print("Please check your MongoDB connection and try again.")
+        exit(1)
+    
+    summary = rank_all_jobs()
+    
+    print("\n✅ Bulk ranking completed successfully!")
+    print(f"- Jobs ranked: {summary['jobs']}")
+    print(f"- Resumes scored: {summary['resumes']}")
+    print(f"- Rankings written: {summary['rankings']}")
+
+if __name__ == "__main__":
+    main()
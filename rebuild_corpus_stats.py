@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Corpus Statistics Rebuild Script for HR Resume System
+This script recounts the term document frequencies used for IDF keyword scoring.
+Run it after turning IDF_KEYWORD_SCORING on: resumes saved while it is off
+are not counted.
+"""
+
+from database import init_db
+from app.utils.corpus_stats import rebuild_corpus_stats
+
+def main():
+    """Rebuild the corpus statistics from all completed resumes."""
+    print("Rebuilding corpus statistics...")
+    
+    if not init_db():
+        print("\n❌ Database connection failed!")
+        print("Please check your MongoDB connection and try again.")
+        exit(1)
+    
+    counted = rebuild_corpus_stats()
+    
+    print("\n✅ Corpus statistics rebuilt successfully!")
+    print(f"- Resumes counted: {counted}")
+
+if __name__ == "__main__":
+    main()
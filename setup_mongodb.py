@@ -1,36 +1,80 @@
 #!/usr/bin/env python3
 """
 MongoDB Database Setup Script for HR Resume System
-This script initializes the MongoDB database with proper configurations.
+This script applies the pending database migrations (indexes, default admin
+user, sample jobs; see app/models/migrations.py). Each migration runs once
+per database and is recorded in the _migrations collection.
+
+Usage:
+    python setup_mongodb.py
+    python setup_mongodb.py --status
 """
 
 import os
-from database import init_db
+import argparse
+from database import mongodb, get_db
+from app.models.migrations import MIGRATIONS, applied_migrations, apply_migrations, pending_migrations
+
+def print_status(db):
+    """Print the applied and pending migrations."""
+    applied = applied_migrations(db)
+    for version, name, _ in MIGRATIONS:
+        record = applied.get(version)
+        if record and record.get('status') == 'applied':
+            print(f"  ✅ {version}: {name} (applied {record['applied_at'].isoformat()})")
+        elif record:
+            print(f"  ⏳ {version}: {name} ({record.get('status')})")
+        else:
+            print(f"  ⬜ {version}: {name} (pending)")
 
 def main():
-    """Initialize MongoDB database."""
+    """Apply the pending database migrations."""
+    parser = argparse.ArgumentParser(description='Apply the HR Resume System database migrations.')
+    parser.add_argument('--status', action='store_true', help='only list the applied and pending migrations')
+    args = parser.parse_args()
+
     print("Setting up MongoDB database for HR Resume System...")
-    
+
     # Check if MongoDB URI is set
     mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/hr_system')
     print(f"MongoDB URI: {mongodb_uri}")
-    
-    # Initialize database
-    if init_db():
-        print("\n✅ MongoDB database setup completed successfully!")
-        print("\nWhat was created:")
-        print("- Connected to MongoDB")
-        print("- Created indexes for performance")
-        print("- Created default admin user")
-        print("- Added sample job data")
-        print("\nDefault Login Credentials:")
-        print("- Email: admin@example.com")
-        print("- Password: admin123")
-        print("\nYou can now start the Flask application.")
-    else:
+
+    if not mongodb.connect():
         print("\n❌ Database setup failed!")
         print("Please check your MongoDB connection and try again.")
         exit(1)
 
+    db = get_db()
+    if args.status:
+        print("\nMigrations:")
+        print_status(db)
+        return
+
+    try:
+        applied = apply_migrations(db)
+    except Exception as e:
+        print(f"\n❌ Migration failed: {str(e)}")
+        exit(1)
+
+    if applied:
+        print("\nApplied migrations:")
+        for version, name in applied:
+            print(f"- {version}: {name}")
+    
+    pending = pending_migrations(db)
+    if pending:
+        version, name, _ = pending[0]
+        print(f"\n❌ Migration {version} ({name}) is being applied by another process.")
+        print("Run this script again once it has finished.")
+        exit(1)
+    if not applied:
+        print("\nDatabase is up to date, no migrations to apply.")
+
+    print("\n✅ MongoDB database setup completed successfully!")
+    print("\nDefault Login Credentials:")
+    print("- Email: admin@example.com")
+    print("- Password: admin123")
+    print("\nYou can now start the Flask application.")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
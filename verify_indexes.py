@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Index Verification Script for HR Resume System
+This script seeds a scratch database on a local MongoDB server, creates the
+registered indexes and explains every registered query. It fails if any
+query plan uses a collection scan (COLLSCAN) or an in-memory SORT.
+
+Usage:
+    python verify_indexes.py
+    python verify_indexes.py --uri mongodb://localhost:27017 --resumes 20000
+"""
+
+import random
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import MongoClient
+from app.models.indexes import INDEXES, create_indexes, explain_queries
+from app.utils.resume_features import FEATURE_VERSION
+
+SKILLS = ['python', 'java', 'sql', 'react', 'docker', 'aws', 'go', 'excel', 'spark', 'linux']
+STATUSES = ['completed', 'completed', 'completed', 'failed', 'processing']
+
+def seed(db, resume_count, job_count, rankings_per_job, seed_value=42):
+    """Fill the scratch database with synthetic users, resumes, jobs and rankings."""
+    rng = random.Random(seed_value)
+    start = datetime(2024, 1, 1)
+
+    db.users.insert_many([
+        {'email': f'user{index}@example.com', 'role': 'user', 'is_active': True}
+        for index in range(100)
+    ])
+
+    resumes = []
+    for index in range(resume_count):
+        digest = hashlib.sha256(str(index).encode()).hexdigest()
+        resumes.append({
+            '_id': ObjectId(),
+            'filename': f'resume_{index}.pdf',
+            'processing_status': rng.choice(STATUSES),
+            'uploaded_at': start + timedelta(seconds=rng.randint(0, 10 ** 7)),
+            'features': {
+                'version': FEATURE_VERSION if rng.random() < 0.95 else FEATURE_VERSION - 1,
+                'skills': rng.sample(SKILLS, rng.randint(0, 4))
+            },
+            'file_hash': digest,
+            'lsh_bands': [f'{band}:{digest[band:band + 16]}' for band in range(16)]
+        })
+    db.resumes.insert_many(resumes)
+
+    jobs = [
+        {
+            '_id': ObjectId(),
+            'title': f'Job {index}',
+            'status': rng.choice(['active', 'active', 'closed']),
+            'created_at': start + timedelta(seconds=rng.randint(0, 10 ** 7))
+        }
+        for index in range(job_count)
+    ]
+    db.jobs.insert_many(jobs)
+
+    rankings = []
+    for job in jobs:
+        for resume in rng.sample(resumes, min(rankings_per_job, len(resumes))):
+            rankings.append({
+                'resume_id': resume['_id'],
+                'job_id': job['_id'],
+                'overall_score': round(rng.random(), 3),
+                'created_at': start
+            })
+    db.rankings.insert_many(rankings)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Check that registered queries are served by indexes.')
+    parser.add_argument('--uri', default='mongodb://localhost:27017', help='local MongoDB server')
+    parser.add_argument('--database', default='hr_index_check', help='scratch database, dropped afterwards')
+    parser.add_argument('--resumes', type=int, default=5000, help='synthetic resumes to seed')
+    parser.add_argument('--jobs', type=int, default=100, help='synthetic jobs to seed')
+    parser.add_argument('--rankings-per-job', type=int, default=200, help='synthetic rankings per job')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database')
+    return parser.parse_args()
+
+def main():
+    """Verify the index registry against a seeded database."""
+    args = parse_args()
+    print("Verifying index registry...")
+
+    client = MongoClient(args.uri, serverSelectionTimeoutMS=5000)
+    try:
+        client.admin.command('ping')
+    except Exception as e:
+        print(f"\n❌ Could not connect to MongoDB: {str(e)}")
+        exit(1)
+
+    db = client[args.database]
+    if any(db[name].estimated_document_count() for name in db.list_collection_names()):
+        print(f"\n❌ Database {args.database} is not empty; pass a scratch database with --database")
+        exit(1)
+
+    try:
+        seed(db, args.resumes, args.jobs, args.rankings_per_job)
+        create_indexes(db)
+        print(f"- Created {len(INDEXES)} indexes")
+
+        failures = 0
+        for collection, name, stages, problem in explain_queries(db):
+            plan = ' > '.join(stages)
+            if problem:
+                failures += 1
+                print(f"❌ {collection}: {name} - {problem} ({plan})")
+            else:
+                print(f"✅ {collection}: {name} ({plan})")
+    finally:
+        if not args.keep:
+            client.drop_database(args.database)
+        client.close()
+
+    if failures:
+        print(f"\n❌ {failures} queries are not served by an index!")
+        exit(1)
+
+    print("\n✅ All registered queries use an index without an in-memory sort.")
+
+if __name__ == "__main__":
+    main()